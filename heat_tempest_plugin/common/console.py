@@ -0,0 +1,105 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent import futures
+import re
+
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+
+
+class ConsoleTailer(object):
+    """Fetch only the console output lines of servers not seen before.
+
+    Nova can only return the last ``length`` lines of a console, so the
+    tailer remembers the last few lines it has seen for every server and
+    asks for a growing number of lines until that anchor shows up again.
+    """
+
+    BOOT_PATTERNS = {
+        'kernel': r'Linux version ',
+        'cloud-init-start': r'Cloud-init v\. \S+ running',
+        'cloud-init-finished': r'Cloud-init v\. \S+ finished',
+        'login': r'login: *$',
+    }
+
+    anchor_size = 5
+
+    def __init__(self, initial_length=100, max_length=2000, patterns=None):
+        self.initial_length = initial_length
+        self.max_length = max_length
+        if patterns is None:
+            patterns = self.BOOT_PATTERNS
+        self.patterns = dict((name, re.compile(pattern, re.MULTILINE))
+                             for name, pattern in patterns.items())
+        self._anchors = {}
+        self._progress = {}
+
+    def tail(self, server):
+        """Return the lines added to the console of server since last call.
+
+        The first call for a server returns up to max_length lines.
+        """
+        anchor = self._anchors.get(server.id)
+        length = self.max_length if anchor is None else self.initial_length
+        while True:
+            lines = server.get_console_output(length=length).splitlines()
+            start = self._find_anchor(lines, anchor)
+            if start is not None:
+                new_lines = lines[start:]
+                break
+            if len(lines) < length or length >= self.max_length:
+                # Either the whole console has been fetched or the anchor
+                # is too far back, in both cases everything is new.
+                new_lines = lines
+                break
+            length = min(length * 4, self.max_length)
+        if lines:
+            self._anchors[server.id] = lines[-self.anchor_size:]
+        self._match_progress(server.id, new_lines)
+        return new_lines
+
+    def tail_many(self, servers):
+        """Tail the console of many servers concurrently.
+
+        :returns: dict mapping server ids to lists of new console lines.
+        """
+        servers = list(servers)
+        if not servers:
+            return {}
+        with futures.ThreadPoolExecutor(
+                max_workers=len(servers)) as executor:
+            return dict(zip((s.id for s in servers),
+                            executor.map(self.tail, servers)))
+
+    def progress(self, server_id):
+        """Return the names of the boot patterns seen on a server console."""
+        return set(self._progress.get(server_id, ()))
+
+    def _find_anchor(self, lines, anchor):
+        if not anchor:
+            return None
+        size = len(anchor)
+        for i in range(len(lines) - size, -1, -1):
+            if lines[i:i + size] == anchor:
+                return i + size
+        return None
+
+    def _match_progress(self, server_id, lines):
+        seen = self._progress.setdefault(server_id, set())
+        text = '\n'.join(lines)
+        for name, pattern in self.patterns.items():
+            if name not in seen and pattern.search(text):
+                LOG.info("Server %s reached boot stage '%s'",
+                         server_id, name)
+                seen.add(name)
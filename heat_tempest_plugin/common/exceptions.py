@@ -63,6 +63,15 @@ class StackResourceBuildErrorException(IntegrationException):
                "'%(resource_status_reason)s'")
 
 
+class TemplateValidationError(IntegrationException):
+    """Raised when a template fails the local template checks."""
+    message = "The template is invalid:\n%(reason)s"
+
+    def __init__(self, *args, **kwargs):
+        super(TemplateValidationError, self).__init__(*args, **kwargs)
+        self.errors = kwargs.get('errors', [])
+
+
 class SSHTimeout(IntegrationException):
     message = ("Connection to the %(host)s via SSH timed out.\n"
                "User: %(user)s, Password: %(password)s")
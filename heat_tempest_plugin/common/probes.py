@@ -0,0 +1,215 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent import futures
+import ipaddress
+import selectors
+import socket
+import struct
+import subprocess
+import time
+import urllib.request
+
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+
+ICMP_PROTOCOLS = {socket.AF_INET: socket.IPPROTO_ICMP,
+                  socket.AF_INET6: socket.IPPROTO_ICMPV6}
+ICMP_ECHO_REQUEST = {socket.AF_INET: 8, socket.AF_INET6: 128}
+ICMP_ECHO_REPLY = {socket.AF_INET: 0, socket.AF_INET6: 129}
+
+
+def probe_http(urls, timeout=120, connect_timeout=2, initial_delay=0.5,
+               max_delay=10):
+    """Wait for HTTP endpoints to respond, probing all of them concurrently.
+
+    Every endpoint is retried with an exponential backoff, starting at
+    initial_delay and capped at max_delay, until it answers or timeout
+    elapses.
+
+    :param urls: iterable of URLs to probe.
+    :param connect_timeout: timeout in seconds of a single request.
+    :returns: dict mapping each URL to the number of seconds until its first
+              successful response, or None if it never responded.
+    """
+    urls = list(urls)
+    if not urls:
+        return {}
+    start = time.time()
+    deadline = start + timeout
+
+    def probe(url):
+        delay = initial_delay
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                urllib.request.urlopen(url, timeout=connect_timeout).close()
+            except IOError as e:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    LOG.warning("%s did not respond after %d attempts: %s",
+                                url, attempts, e)
+                    return None
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, max_delay)
+            else:
+                elapsed = time.time() - start
+                LOG.info("%s responded after %d attempts (%.2f s)",
+                         url, attempts, elapsed)
+                return elapsed
+
+    with futures.ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        return dict(zip(urls, executor.map(probe, urls)))
+
+
+def ping(addresses, timeout, should_succeed=True, interval=1,
+         on_transition=None):
+    """Wait until each address is reachable, or unreachable, via ICMP echo.
+
+    All addresses are probed from one unprivileged ICMP datagram socket per
+    address family when the kernel allows it (see the
+    net.ipv4.ping_group_range sysctl), otherwise a ping subprocess is run per
+    address and attempt.
+
+    :param addresses: iterable of IP addresses.
+    :param timeout: number of seconds to wait for all addresses.
+    :param should_succeed: whether to wait for the addresses to become
+                           reachable or unreachable.
+    :param interval: seconds between echo requests, an address without a
+                     reply within this time is considered unreachable.
+    :param on_transition: callable called with the address, its new
+                          reachability and the elapsed seconds whenever an
+                          address changes state.
+    :returns: dict mapping each address to True if it reached the expected
+              state before timeout.
+    """
+    addresses = list(addresses)
+    try:
+        ips = dict((ipaddress.ip_address(a), a) for a in addresses)
+    except ValueError:
+        ips = None
+    sockets = {}
+    if ips is not None:
+        try:
+            for family in set(socket.AF_INET if ip.version == 4
+                              else socket.AF_INET6 for ip in ips):
+                sockets[family] = socket.socket(
+                    family, socket.SOCK_DGRAM, ICMP_PROTOCOLS[family])
+        except OSError as e:
+            LOG.debug("ICMP datagram sockets are not available (%s), "
+                      "falling back to ping subprocesses", e)
+            for sock in sockets.values():
+                sock.close()
+            sockets = {}
+    if not sockets:
+        return _ping_subprocess(addresses, timeout, should_succeed,
+                                interval, on_transition)
+    try:
+        return _ping_icmp(sockets, ips, timeout, should_succeed, interval,
+                          on_transition)
+    finally:
+        for sock in sockets.values():
+            sock.close()
+
+
+def _ping_icmp(sockets, ips, timeout, should_succeed, interval,
+               on_transition):
+    start = time.time()
+    deadline = start + timeout
+    state = dict.fromkeys(ips.values())
+    pending = set(ips)
+    selector = selectors.DefaultSelector()
+    for family, sock in sockets.items():
+        sock.setblocking(False)
+        selector.register(sock, selectors.EVENT_READ, family)
+
+    def transition(ip, reachable):
+        address = ips[ip]
+        if state[address] != reachable:
+            state[address] = reachable
+            elapsed = time.time() - start
+            LOG.info("%s became %s after %.2f s", address,
+                     'reachable' if reachable else 'unreachable', elapsed)
+            if on_transition is not None:
+                on_transition(address, reachable, elapsed)
+        if reachable == should_succeed:
+            pending.discard(ip)
+
+    seq = 0
+    try:
+        while pending and time.time() < deadline:
+            seq = (seq + 1) & 0xffff
+            answered = set()
+            for ip in pending:
+                family = (socket.AF_INET if ip.version == 4
+                          else socket.AF_INET6)
+                # The kernel fills in the identifier and the checksum.
+                packet = struct.pack('!BBHHH', ICMP_ECHO_REQUEST[family],
+                                     0, 0, 0, seq)
+                try:
+                    sockets[family].sendto(packet, (str(ip), 0))
+                except OSError as e:
+                    LOG.debug("Failed to send echo request to %s: %s",
+                              ip, e)
+            round_end = min(time.time() + interval, deadline)
+            while pending - answered and time.time() < round_end:
+                for key, _mask in selector.select(round_end - time.time()):
+                    try:
+                        data, source = key.fileobj.recvfrom(1024)
+                    except OSError:
+                        continue
+                    if (len(data) < 8 or
+                            data[0] != ICMP_ECHO_REPLY[key.data] or
+                            struct.unpack('!H', data[6:8])[0] != seq):
+                        continue
+                    ip = ipaddress.ip_address(source[0].split('%')[0])
+                    if ip in pending:
+                        answered.add(ip)
+                        transition(ip, True)
+            for ip in list(pending):
+                if ip not in answered:
+                    transition(ip, False)
+    finally:
+        selector.close()
+    return dict((address, reachable == should_succeed)
+                for address, reachable in state.items())
+
+
+def _ping_subprocess(addresses, timeout, should_succeed, interval,
+                     on_transition):
+    start = time.time()
+    deadline = start + timeout
+
+    def ping_one(address):
+        cmd = ['ping', '-c1', '-w%d' % max(interval, 1), address]
+        reachable = None
+        while True:
+            proc = subprocess.Popen(cmd,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE)
+            proc.communicate()
+            if (proc.returncode == 0) != reachable:
+                reachable = proc.returncode == 0
+                if on_transition is not None:
+                    on_transition(address, reachable, time.time() - start)
+            if reachable == should_succeed:
+                return True
+            if time.time() >= deadline:
+                return False
+            time.sleep(min(interval, max(deadline - time.time(), 0)))
+
+    if not addresses:
+        return {}
+    with futures.ThreadPoolExecutor(max_workers=len(addresses)) as executor:
+        return dict(zip(addresses, executor.map(ping_one, addresses)))
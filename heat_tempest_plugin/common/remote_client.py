@@ -10,9 +10,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
+import errno
+import hashlib
 import re
 import select
+import selectors
 import socket
+import threading
 import time
 
 import io
@@ -23,6 +28,171 @@ from heat_tempest_plugin.common import exceptions
 
 LOG = logging.getLogger(__name__)
 
+STDOUT = 'stdout'
+STDERR = 'stderr'
+STREAM_BUF_SIZE = 65536
+# Amount of stderr kept for SSHExecCommandFailed when streaming output.
+STDERR_TAIL_SIZE = 65536
+
+# Key classes tried, in order, when parsing a private key.
+PKEY_CLASSES = (paramiko.Ed25519Key, paramiko.ECDSAKey, paramiko.RSAKey)
+
+_pkey_cache = {}
+_pkey_cache_lock = threading.Lock()
+
+
+def load_private_key(private_key):
+    """Return a paramiko key for the given private key text.
+
+    The key type is detected among PKEY_CLASSES. Parsed keys are cached for
+    the lifetime of the process, keyed by a digest of the key material, so
+    every client sharing a keypair reuses the same PKey object.
+
+    :raises: paramiko.SSHException if the key can not be parsed.
+    """
+    digest = hashlib.sha256(private_key.encode('utf-8')).hexdigest()
+    with _pkey_cache_lock:
+        pkey = _pkey_cache.get(digest)
+        if pkey is None:
+            pkey = _pkey_cache[digest] = _parse_private_key(private_key)
+    return pkey
+
+
+def _parse_private_key(private_key):
+    for pkey_class in PKEY_CLASSES:
+        try:
+            return pkey_class.from_private_key(io.StringIO(private_key))
+        except (paramiko.SSHException, ValueError) as e:
+            LOG.debug("Private key is not a %s key: %s",
+                      pkey_class.__name__, e)
+    raise paramiko.SSHException("Unsupported private key type, expected "
+                                "one of %s" % ', '.join(
+                                    c.__name__ for c in PKEY_CLASSES))
+
+
+def run_concurrently(func, items, max_workers=None):
+    """Call func for every item in a thread pool.
+
+    :returns: list of (item, result, error, duration) tuples in the order
+              of items, where error is the exception raised by func, if any.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def timed_call(item):
+        start = time.time()
+        try:
+            return item, func(item), None, time.time() - start
+        except Exception as e:
+            return item, None, e, time.time() - start
+
+    with futures.ThreadPoolExecutor(
+            max_workers=max_workers or len(items)) as executor:
+        return list(executor.map(timed_call, items))
+
+
+def wait_for_ssh_banner(hosts, port=22, timeout=300, connect_timeout=10,
+                        retry_interval=0.5):
+    """Wait until sshd on the hosts accepts connections and sends a banner.
+
+    This is a cheap probe to run before a full paramiko handshake. All hosts
+    are watched from a single selector with non-blocking sockets, so a host
+    is reported ready within milliseconds of sshd coming up.
+
+    :param hosts: iterable of host names or addresses.
+    :param timeout: overall number of seconds to wait for all hosts.
+    :param connect_timeout: seconds to wait for the banner on one connection
+                            before reconnecting.
+    :param retry_interval: seconds to wait before reconnecting to a host
+                           which refused or dropped the connection.
+    :returns: set of the hosts which sent an SSH banner before timeout.
+    """
+    deadline = time.time() + timeout
+    pending = set(hosts)
+    ready = set()
+    retry_at = dict.fromkeys(pending, 0)
+    connections = {}
+    selector = selectors.DefaultSelector()
+
+    def drop(host):
+        sock, _started, _banner = connections.pop(host)
+        selector.unregister(sock)
+        sock.close()
+
+    def reset(host):
+        drop(host)
+        retry_at[host] = time.time() + retry_interval
+
+    try:
+        while pending:
+            now = time.time()
+            if now >= deadline:
+                break
+            for host in pending - set(connections):
+                if retry_at[host] > now:
+                    continue
+                try:
+                    family, socktype, proto, _name, addr = socket.getaddrinfo(
+                        host, port, type=socket.SOCK_STREAM)[0]
+                    sock = socket.socket(family, socktype, proto)
+                except socket.error:
+                    retry_at[host] = now + retry_interval
+                    continue
+                sock.setblocking(False)
+                if sock.connect_ex(addr) not in (0, errno.EINPROGRESS,
+                                                 errno.EWOULDBLOCK):
+                    sock.close()
+                    retry_at[host] = now + retry_interval
+                    continue
+                connections[host] = (sock, now, b'')
+                selector.register(
+                    sock, selectors.EVENT_READ | selectors.EVENT_WRITE, host)
+            for host, (sock, started, banner) in list(connections.items()):
+                if now - started >= connect_timeout:
+                    reset(host)
+
+            # Wake up for the next reconnection and for the next connection
+            # to give up on, whichever comes first.
+            wake_at = min([deadline] +
+                          [retry_at[h] for h in pending
+                           if h not in connections] +
+                          [started + connect_timeout
+                           for _sock, started, _banner
+                           in connections.values()])
+            for key, mask in selector.select(max(wake_at - now, 0)):
+                host = key.data
+                sock, started, banner = connections[host]
+                if mask & selectors.EVENT_WRITE:
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                        reset(host)
+                        continue
+                    selector.modify(sock, selectors.EVENT_READ, host)
+                if not mask & selectors.EVENT_READ:
+                    continue
+                try:
+                    data = sock.recv(256)
+                except BlockingIOError:
+                    continue
+                except socket.error:
+                    reset(host)
+                    continue
+                if not data:
+                    reset(host)
+                    continue
+                banner += data
+                connections[host] = (sock, started, banner)
+                if b'SSH-' in banner:
+                    LOG.debug("ssh banner received from %s", host)
+                    drop(host)
+                    pending.discard(host)
+                    ready.add(host)
+    finally:
+        for sock, _started, _banner in connections.values():
+            sock.close()
+        selector.close()
+    return ready
+
 
 class Client(object):
 
@@ -32,14 +202,20 @@ class Client(object):
         self.username = username
         self.password = password
         if isinstance(pkey, str):
-            pkey = paramiko.RSAKey.from_private_key(
-                io.StringIO(str(pkey)))
+            pkey = load_private_key(pkey)
         self.pkey = pkey
         self.look_for_keys = look_for_keys
         self.key_filename = key_filename
         self.timeout = int(timeout)
         self.channel_timeout = float(channel_timeout)
         self.buf_size = 1024
+        self._ssh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _get_ssh_connection(self, sleep=1.5, backoff=1):
         """Returns an ssh connection to the specified host."""
@@ -58,6 +234,14 @@ class Client(object):
                      self.host, self.username, str(self.password))
         attempts = 0
         while True:
+            remaining = self.timeout - (time.time() - _start_time)
+            if not wait_for_ssh_banner([self.host], timeout=remaining,
+                                       connect_timeout=self.channel_timeout):
+                LOG.error("sshd on %s did not become reachable within %d"
+                          " seconds", self.host, self.timeout)
+                raise exceptions.SSHTimeout(host=self.host,
+                                            user=self.username,
+                                            password=self.password)
             try:
                 ssh.connect(self.host, username=self.username,
                             password=self.password,
@@ -76,69 +260,230 @@ class Client(object):
                     raise exceptions.SSHTimeout(host=self.host,
                                                 user=self.username,
                                                 password=self.password)
-                bsleep += backoff
                 attempts += 1
-                LOG.warning("Failed to establish authenticated ssh"
-                            " connection to %s@%s (%s). Number attempts: %s."
-                            " Retry after %d seconds.",
-                            self.username, self.host, e, attempts, bsleep)
+                bsleep += backoff
+                if isinstance(e, socket.error):
+                    # sshd went away, its banner is waited for again after
+                    # the backoff.
+                    LOG.warning("Failed to connect to ssh on %s (%s)."
+                                " Number attempts: %s. Retry after %d"
+                                " seconds.", self.host, e, attempts, bsleep)
+                else:
+                    LOG.warning("Failed to establish authenticated ssh"
+                                " connection to %s@%s (%s). Number"
+                                " attempts: %s. Retry after %d seconds.",
+                                self.username, self.host, e, attempts,
+                                bsleep)
                 time.sleep(bsleep)
 
     def _is_timed_out(self, start_time):
         return (time.time() - self.timeout) > start_time
 
+    def _is_connection_alive(self):
+        if self._ssh is None:
+            return False
+        transport = self._ssh.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+        except (socket.error, EOFError, paramiko.SSHException):
+            return False
+        return True
+
+    def _get_connection(self):
+        """Returns the persistent ssh connection, reconnecting if needed."""
+        if not self._is_connection_alive():
+            if self._ssh is not None:
+                LOG.info("ssh connection to %s@%s is no longer active,"
+                         " reconnecting", self.username, self.host)
+            self.close()
+            self._ssh = self._get_ssh_connection()
+        return self._ssh
+
+    def _open_session(self):
+        try:
+            return self._get_connection().get_transport().open_session()
+        except (socket.error, EOFError, paramiko.SSHException):
+            # The transport may have died between the health check and
+            # opening the channel, so retry once on a fresh connection.
+            self.close()
+            return self._get_connection().get_transport().open_session()
+
+    def close(self):
+        """Close the persistent ssh connection, if any."""
+        if self._ssh is not None:
+            self._ssh.close()
+            self._ssh = None
+
+    def exec_command_stream(self, cmd, buf_size=None):
+        """Execute the specified command on the server, streaming output.
+
+        Output is yielded as soon as it is read from the channel, so the
+        whole output never has to be held in memory.
+
+        :param buf_size: maximum size of each chunk read from the channel,
+                         defaults to STREAM_BUF_SIZE.
+        :returns: generator of (stream, chunk) tuples, where stream is
+                  STDOUT or STDERR and chunk is the bytes read.
+        :raises: SSHExecCommandFailed once the output is exhausted if command
+                 returns nonzero status. The exception contains the tail of
+                 the command stderr content.
+        """
+        buf_size = buf_size or STREAM_BUF_SIZE
+        channel = self._open_session()
+        # The channel is closed even if the consumer stops iterating early,
+        # so abandoned channels do not pile up on the persistent connection.
+        try:
+            channel.fileno()  # Register event pipe
+            channel.exec_command(cmd)
+            channel.shutdown_write()
+            err_tail = b''
+            poll = select.poll()
+            poll.register(channel, select.POLLIN)
+            start_time = time.time()
+
+            while True:
+                ready = poll.poll(self.channel_timeout)
+                if not any(ready):
+                    if not self._is_timed_out(start_time):
+                        continue
+                    raise exceptions.TimeoutException(
+                        "Command: '{0}' executed on host '{1}'.".format(
+                            cmd, self.host))
+                if not ready[0]:  # If there is nothing to read.
+                    continue
+                out_chunk = err_chunk = None
+                if channel.recv_ready():
+                    out_chunk = channel.recv(buf_size)
+                    if out_chunk:
+                        yield STDOUT, out_chunk
+                if channel.recv_stderr_ready():
+                    err_chunk = channel.recv_stderr(buf_size)
+                    if err_chunk:
+                        err_tail = (err_tail + err_chunk)[-STDERR_TAIL_SIZE:]
+                        yield STDERR, err_chunk
+                if channel.closed and not err_chunk and not out_chunk:
+                    break
+            exit_status = channel.recv_exit_status()
+        finally:
+            channel.close()
+        if 0 != exit_status:
+            raise exceptions.SSHExecCommandFailed(
+                command=cmd, exit_status=exit_status,
+                strerror=err_tail.decode('utf-8', 'replace'))
+
+    def exec_command_to(self, cmd, stdout, stderr=None, buf_size=None):
+        """Execute the specified command, writing output to file-like sinks.
+
+        :param stdout: binary file-like object receiving standard output.
+        :param stderr: binary file-like object receiving standard error, if
+                       given.
+        :raises: SSHExecCommandFailed if command returns nonzero status.
+        """
+        sinks = {STDOUT: stdout, STDERR: stderr}
+        for stream, chunk in self.exec_command_stream(cmd, buf_size):
+            if sinks[stream] is not None:
+                sinks[stream].write(chunk)
+
     def exec_command(self, cmd):
         """Execute the specified command on the server.
 
         Note that this method is reading whole command outputs to memory, thus
-        shouldn't be used for large outputs.
+        shouldn't be used for large outputs, see exec_command_stream instead.
 
         :returns: data read from standard output of the command.
         :raises: SSHExecCommandFailed if command returns nonzero
                  status. The exception contains command status stderr content.
         """
-        ssh = self._get_ssh_connection()
-        transport = ssh.get_transport()
-        channel = transport.open_session()
-        channel.fileno()  # Register event pipe
-        channel.exec_command(cmd)
-        channel.shutdown_write()
-        out_data = []
-        err_data = []
+        out = io.BytesIO()
+        self.exec_command_to(cmd, out, buf_size=self.buf_size)
+        return out.getvalue().decode('utf-8', 'replace')
+
+    def exec_commands(self, commands):
+        """Execute several commands concurrently over one ssh transport.
+
+        Every command gets its own channel on the persistent connection and
+        all the channels are read from a single poll loop, so the commands
+        cost roughly one round-trip in total.
+
+        :param commands: dict mapping names to the commands to execute.
+        :returns: dict mapping names to data read from standard output of
+                  the respective command.
+        :raises: SSHExecCommandFailed if any command returns nonzero status.
+        """
+        channels = {}
+        out_data = {}
+        err_data = {}
         poll = select.poll()
-        poll.register(channel, select.POLLIN)
-        start_time = time.time()
+        transport = None
+        try:
+            for name, cmd in commands.items():
+                if transport is None:
+                    channel = self._open_session()
+                    transport = channel.get_transport()
+                else:
+                    # Reconnecting now would close the channels already
+                    # opened, so the other channels share the transport of
+                    # the first one.
+                    channel = transport.open_session()
+                fd = channel.fileno()  # Register event pipe
+                channels[fd] = (name, channel)
+                channel.exec_command(cmd)
+                channel.shutdown_write()
+                poll.register(channel, select.POLLIN)
+                out_data[name] = []
+                err_data[name] = []
+            open_fds = set(channels)
+            start_time = time.time()
 
-        while True:
-            ready = poll.poll(self.channel_timeout)
-            if not any(ready):
-                if not self._is_timed_out(start_time):
-                    continue
-                raise exceptions.TimeoutException(
-                    "Command: '{0}' executed on host '{1}'.".format(
-                        cmd, self.host))
-            if not ready[0]:  # If there is nothing to read.
-                continue
-            out_chunk = err_chunk = None
-            if channel.recv_ready():
-                out_chunk = channel.recv(self.buf_size)
-                out_data += out_chunk,
-            if channel.recv_stderr_ready():
-                err_chunk = channel.recv_stderr(self.buf_size)
-                err_data += err_chunk,
-            if channel.closed and not err_chunk and not out_chunk:
-                break
-        exit_status = channel.recv_exit_status()
-        if 0 != exit_status:
-            raise exceptions.SSHExecCommandFailed(
-                command=cmd, exit_status=exit_status,
-                strerror=''.join(err_data))
-        return ''.join(out_data)
+            while open_fds:
+                ready = poll.poll(self.channel_timeout)
+                if not any(ready):
+                    if not self._is_timed_out(start_time):
+                        continue
+                    raise exceptions.TimeoutException(
+                        "Commands: '{0}' executed on host '{1}'.".format(
+                            "', '".join(commands.values()), self.host))
+                for fd, _event in ready:
+                    if fd not in open_fds:
+                        continue
+                    name, channel = channels[fd]
+                    out_chunk = err_chunk = None
+                    if channel.recv_ready():
+                        out_chunk = channel.recv(STREAM_BUF_SIZE)
+                        out_data[name].append(out_chunk)
+                    if channel.recv_stderr_ready():
+                        err_chunk = channel.recv_stderr(STREAM_BUF_SIZE)
+                        err_data[name].append(err_chunk)
+                    if channel.closed and not err_chunk and not out_chunk:
+                        poll.unregister(channel)
+                        open_fds.discard(fd)
+
+            exit_statuses = dict(
+                (name, channel.recv_exit_status())
+                for name, channel in channels.values())
+        finally:
+            for _name, channel in channels.values():
+                channel.close()
+
+        results = {}
+        for name, exit_status in exit_statuses.items():
+            if 0 != exit_status:
+                raise exceptions.SSHExecCommandFailed(
+                    command=commands[name], exit_status=exit_status,
+                    strerror=b''.join(err_data[name]).decode(
+                        'utf-8', 'replace'))
+            results[name] = b''.join(out_data[name]).decode(
+                'utf-8', 'replace')
+        return results
 
     def test_connection_auth(self):
-        """Raises an exception when we can not connect to server via ssh."""
-        connection = self._get_ssh_connection()
-        connection.close()
+        """Raises an exception when we can not connect to server via ssh.
+
+        The connection is kept open and reused by subsequent commands.
+        """
+        self._get_connection()
 
 
 class RemoteClient(object):
@@ -165,9 +510,24 @@ class RemoteClient(object):
                                  ssh_timeout, pkey=pkey,
                                  channel_timeout=ssh_channel_timeout)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.ssh_client.close()
+
     def exec_command(self, cmd):
         return self.ssh_client.exec_command(cmd)
 
+    def exec_command_stream(self, cmd, buf_size=None):
+        return self.ssh_client.exec_command_stream(cmd, buf_size)
+
+    def exec_command_to(self, cmd, stdout, stderr=None, buf_size=None):
+        return self.ssh_client.exec_command_to(cmd, stdout, stderr, buf_size)
+
     def validate_authentication(self):
         """Validate ssh connection and authentication.
 
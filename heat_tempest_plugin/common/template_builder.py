@@ -0,0 +1,229 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Immutable template values for building test templates.
+
+freeze() turns a template made of dicts and lists into FrozenMap and
+FrozenList values. They can not be modified in place; methods such as
+FrozenMap.set_in() return a new value that shares every untouched subtree
+with the original, so deriving a variant of a large template is cheap.
+
+Every value carries a content digest computed from the digests of its
+children, which makes it usable as a cache key, and identical values are
+interned so they are represented by a single object. The JSON serialisation
+of each value is computed once and reused by its parents.
+"""
+
+import collections.abc
+import datetime
+import hashlib
+import json
+import weakref
+
+_interned = weakref.WeakValueDictionary()
+
+
+def freeze(value):
+    """Return an immutable version of a template or template snippet."""
+    if isinstance(value, (FrozenMap, FrozenList)):
+        return value
+    if isinstance(value, collections.abc.Mapping):
+        for key in value:
+            if not isinstance(key, str):
+                raise TypeError('%r can not be used as a template key' %
+                                (key,))
+        return FrozenMap._make(
+            dict((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return FrozenList._make(tuple(freeze(v) for v in value))
+    if isinstance(value, datetime.date):
+        # YAML parses unquoted versions such as 2015-10-15 as dates
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    raise TypeError('%r can not be used in a template' % (value,))
+
+
+def thaw(value):
+    """Return a mutable copy of a frozen value, made of dicts and lists."""
+    if isinstance(value, FrozenMap):
+        return dict((k, thaw(v)) for k, v in value.items())
+    if isinstance(value, FrozenList):
+        return [thaw(v) for v in value]
+    return value
+
+
+def _digest(value):
+    if isinstance(value, (FrozenMap, FrozenList)):
+        return value._digest
+    return hashlib.sha256(b'v' + json.dumps(value).encode('utf-8')).digest()
+
+
+def _to_json(value):
+    if isinstance(value, (FrozenMap, FrozenList)):
+        return value.to_json()
+    return json.dumps(value)
+
+
+def _intern(value):
+    existing = _interned.get(value._digest)
+    if existing is not None:
+        return existing
+    _interned[value._digest] = value
+    return value
+
+
+class _FrozenValue(object):
+    __slots__ = ('_data', '_digest', '_json', '__weakref__')
+
+    def __hash__(self):
+        return hash(self._digest)
+
+    def __eq__(self, other):
+        if isinstance(other, _FrozenValue):
+            return self._digest == other._digest
+        return thaw(self) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self._data)
+
+    @property
+    def digest(self):
+        """Hex digest of the content of the value."""
+        return self._digest.hex()
+
+    def to_json(self):
+        """Return the JSON serialisation, computed only once."""
+        if self._json is None:
+            self._json = self._serialise()
+        return self._json
+
+    def thaw(self):
+        return thaw(self)
+
+
+class FrozenMap(_FrozenValue, collections.abc.Mapping):
+    """An immutable mapping, see the module documentation."""
+
+    __slots__ = ()
+
+    @classmethod
+    def _make(cls, data):
+        self = object.__new__(cls)
+        self._data = data
+        sha = hashlib.sha256(b'm')
+        for key in sorted(data):
+            sha.update(_digest(key))
+            sha.update(_digest(data[key]))
+        self._digest = sha.digest()
+        self._json = None
+        return _intern(self)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def _serialise(self):
+        return '{%s}' % ', '.join(
+            '%s: %s' % (json.dumps(key), _to_json(self._data[key]))
+            for key in sorted(self._data))
+
+    def set(self, key, value):
+        """Return a copy with key set to value."""
+        data = dict(self._data)
+        data[key] = freeze(value)
+        return FrozenMap._make(data)
+
+    def update(self, values):
+        """Return a copy with all the keys and values of values set."""
+        data = dict(self._data)
+        data.update((k, freeze(v)) for k, v in values.items())
+        return FrozenMap._make(data)
+
+    def delete(self, key):
+        """Return a copy without key."""
+        data = dict(self._data)
+        del data[key]
+        return FrozenMap._make(data)
+
+    def get_in(self, path, default=None):
+        """Return the value at a path of keys, or default if missing."""
+        value = self
+        for key in path:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                return default
+        return value
+
+    def set_in(self, path, value):
+        """Return a copy with the value at a path of keys replaced.
+
+        Missing intermediate mappings are created.
+        """
+        key = path[0]
+        if len(path) > 1:
+            child = self.get(key, FrozenMap._make({}))
+            value = child.set_in(path[1:], value)
+        return self.set(key, value)
+
+    def update_in(self, path, values):
+        """Return a copy with the mapping at a path of keys updated."""
+        return self.set_in(
+            path, self.get_in(path, FrozenMap._make({})).update(values))
+
+
+class FrozenList(_FrozenValue, collections.abc.Sequence):
+    """An immutable list, see the module documentation."""
+
+    __slots__ = ()
+
+    @classmethod
+    def _make(cls, data):
+        self = object.__new__(cls)
+        self._data = data
+        sha = hashlib.sha256(b'l')
+        for item in data:
+            sha.update(_digest(item))
+        self._digest = sha.digest()
+        self._json = None
+        return _intern(self)
+
+    def __getitem__(self, index):
+        return self._data[index]
+
+    def __len__(self):
+        return len(self._data)
+
+    def _serialise(self):
+        return '[%s]' % ', '.join(_to_json(item) for item in self._data)
+
+    def set_in(self, path, value):
+        """Return a copy with the value at a path of indexes replaced."""
+        index = path[0]
+        if len(path) > 1:
+            value = self._data[index].set_in(path[1:], value)
+        data = list(self._data)
+        data[index] = freeze(value)
+        return FrozenList._make(tuple(data))
+
+    def append(self, value):
+        """Return a copy with value appended."""
+        return FrozenList._make(self._data + (freeze(value),))
@@ -0,0 +1,54 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Template parsing and serialisation shared by the tests.
+
+The libyaml based loader and dumper are used when PyYAML was built with
+them, they are considerably faster than the pure Python implementation on
+large templates.
+"""
+
+import copy
+import functools
+
+import yaml
+
+if hasattr(yaml, 'CSafeLoader'):
+    yaml_loader = yaml.CSafeLoader
+    yaml_dumper = yaml.CSafeDumper
+else:
+    yaml_loader = yaml.SafeLoader
+    yaml_dumper = yaml.SafeDumper
+
+
+def parse(tmpl_str):
+    """Parse a YAML (or JSON) template string."""
+    return yaml.load(tmpl_str, Loader=yaml_loader)
+
+
+def dump(template):
+    """Serialise a template to a YAML string."""
+    return yaml.dump(template, Dumper=yaml_dumper)
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_cached(tmpl_str):
+    return parse(tmpl_str)
+
+
+def parse_snippet(tmpl_str):
+    """Parse a template or snippet, parsing each distinct string only once.
+
+    A copy of the parsed data is returned, so the caller is free to modify
+    it.
+    """
+    return copy.deepcopy(_parse_cached(tmpl_str))
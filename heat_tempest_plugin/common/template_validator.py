@@ -0,0 +1,697 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Local checks of HOT templates, without calling the Heat API.
+
+The checks cover the template structure and version, the shape of the
+intrinsic functions and the references they make, and the parameter
+constraints that can be evaluated without other services. Resource types and
+properties are checked against the schemas reported by Heat, fetched once
+per process.
+
+This is only meant to screen out obviously invalid templates cheaply, the
+Heat API remains the authoritative validator: a template accepted here may
+still be rejected by Heat. Heat only resolves the parameters referenced by
+outputs when the outputs are shown, so a missing one is logged as a warning
+rather than reported as an error.
+"""
+
+import datetime
+import json
+import numbers
+import re
+import threading
+
+from oslo_log import log as logging
+from oslo_utils import strutils
+import yaml
+
+from heat_tempest_plugin.common import exceptions
+from heat_tempest_plugin.common import template_format
+
+LOG = logging.getLogger(__name__)
+
+HOT_VERSIONS = ('2013-05-23', '2014-10-16', '2015-04-30', '2015-10-15',
+                '2016-04-08', '2016-10-14', '2017-02-24', '2017-09-01',
+                '2018-03-02', '2018-08-31', '2021-04-16')
+HOT_VERSION_ALIASES = {'newton': '2016-10-14', 'ocata': '2017-02-24',
+                       'pike': '2017-09-01', 'queens': '2018-03-02',
+                       'rocky': '2018-08-31', 'wallaby': '2021-04-16'}
+CFN_VERSIONS = {'AWSTemplateFormatVersion': ('2010-09-09',),
+                'HeatTemplateFormatVersion': ('2012-12-12',)}
+
+SECTIONS = ('heat_template_version', 'description', 'parameter_groups',
+            'parameters', 'resources', 'outputs', 'conditions')
+PARAMETER_TYPES = ('string', 'number', 'json', 'comma_delimited_list',
+                   'boolean')
+PARAMETER_KEYS = ('type', 'label', 'description', 'default', 'hidden',
+                  'constraints', 'immutable', 'tags')
+CONSTRAINT_TYPES = ('length', 'range', 'modulo', 'allowed_values',
+                    'allowed_pattern', 'custom_constraint')
+RESOURCE_KEYS = ('type', 'properties', 'metadata', 'depends_on',
+                 'update_policy', 'deletion_policy', 'condition',
+                 'external_id')
+DELETION_POLICIES = ('Delete', 'Retain', 'Snapshot')
+PSEUDO_PARAMETERS = ('OS::stack_id', 'OS::stack_name', 'OS::project_id')
+# Resource types whose attributes depend on their members, their deployed
+# config or their nested stack, so they can not be checked from the schema.
+DYNAMIC_ATTRIBUTE_TYPES = (
+    'OS::Heat::ResourceGroup', 'OS::Heat::AutoScalingGroup',
+    'AWS::AutoScaling::AutoScalingGroup', 'OS::Heat::ResourceChain',
+    'OS::Heat::SoftwareDeployment', 'OS::Heat::SoftwareDeploymentGroup',
+    'OS::Heat::SoftwareDeployments', 'OS::Heat::StructuredDeployment',
+    'OS::Heat::StructuredDeploymentGroup', 'OS::Heat::StructuredDeployments',
+    'AWS::CloudFormation::Stack')
+
+# The first HOT version supporting each intrinsic function, functions
+# available in every version map to the first one.
+FUNCTION_VERSIONS = {
+    'get_param': '2013-05-23', 'get_resource': '2013-05-23',
+    'get_attr': '2013-05-23', 'get_file': '2013-05-23',
+    'list_join': '2013-05-23', 'str_replace': '2013-05-23',
+    'resource_facade': '2013-05-23', 'repeat': '2015-04-30',
+    'digest': '2015-04-30', 'str_split': '2015-10-15',
+    'map_merge': '2016-04-08', 'yaql': '2016-10-14',
+    'equals': '2016-10-14', 'if': '2016-10-14', 'not': '2016-10-14',
+    'and': '2016-10-14', 'or': '2016-10-14',
+    'map_replace': '2016-10-14', 'filter': '2017-02-24',
+    'str_replace_strict': '2017-02-24', 'make_url': '2017-09-01',
+    'list_concat': '2017-09-01', 'list_concat_unique': '2017-09-01',
+    'contains': '2017-09-01', 'str_replace_vstrict': '2017-09-01',
+}
+CONDITIONS_VERSION = '2016-10-14'
+
+_schemas_lock = threading.Lock()
+_type_names = None
+_type_schemas = {}
+
+
+class ResourceTypeSchemas(object):
+    """Resource types and their schemas, as reported by the Heat API.
+
+    The list of types and every schema are fetched at most once per
+    process, whatever the number of instances.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def names(self):
+        global _type_names
+        with _schemas_lock:
+            if _type_names is None:
+                _type_names = frozenset(
+                    t.resource_type
+                    for t in self.client.resource_types.list())
+            return _type_names
+
+    def get(self, resource_type):
+        """Return the schema of a resource type, or None if unknown."""
+        if resource_type not in self.names():
+            return None
+        with _schemas_lock:
+            if resource_type not in _type_schemas:
+                _type_schemas[resource_type] = self.client.resource_types.get(
+                    resource_type)
+            return _type_schemas[resource_type]
+
+
+def validate(template, files=None, parameters=None, schemas=None,
+             environment=None):
+    """Check a template locally.
+
+    :param template: template string, mapping or frozen template.
+    :param files: the files map, nested templates found in it are checked
+                  too.
+    :param parameters: parameter values to check against the constraints.
+    :param schemas: a ResourceTypeSchemas, resource types and properties are
+                    only checked when it is given.
+    :param environment: the environment, as a string or a mapping. Types
+                        mapped by its resource_registry are resolved, its
+                        parameters are checked like parameters and its
+                        parameter_defaults count as values of the
+                        parameters of nested templates.
+    :returns: list of error messages, empty if no problem was found.
+    """
+    if isinstance(environment, (str, bytes)):
+        try:
+            environment = template_format.parse(environment)
+        except yaml.YAMLError as e:
+            return ['The environment could not be parsed: %s' % e]
+    environment = environment or {}
+    if not _is_mapping(environment):
+        return ['The environment is not a JSON object or YAML mapping.']
+    env_parameters = environment.get('parameters') or {}
+    if _is_mapping(env_parameters):
+        parameters = dict(env_parameters, **(parameters or {}))
+    registry = environment.get('resource_registry') or {}
+    parameter_defaults = environment.get('parameter_defaults') or {}
+    return _Validator(files, schemas, registry,
+                      parameter_defaults).validate(template, parameters)
+
+
+def check(template, files=None, parameters=None, schemas=None,
+          environment=None):
+    """Like validate(), but raise TemplateValidationError on errors."""
+    errors = validate(template, files, parameters, schemas, environment)
+    if errors:
+        raise exceptions.TemplateValidationError(
+            errors=errors, reason='\n'.join(errors))
+
+
+def _is_mapping(value):
+    return isinstance(value, dict) or (
+        hasattr(value, 'keys') and hasattr(value, '__getitem__'))
+
+
+def _is_list(value):
+    return isinstance(value, (list, tuple)) or (
+        hasattr(value, '__getitem__') and not _is_mapping(value) and
+        not isinstance(value, (str, bytes)))
+
+
+def _version_string(version):
+    if isinstance(version, datetime.date):
+        return version.isoformat()
+    return HOT_VERSION_ALIASES.get(version, version)
+
+
+class _Validator(object):
+
+    def __init__(self, files, schemas, registry=None,
+                 parameter_defaults=None):
+        self.files = files or {}
+        self.schemas = schemas
+        self.registry = registry if _is_mapping(registry) else {}
+        self.parameter_defaults = (parameter_defaults
+                                   if _is_mapping(parameter_defaults)
+                                   else {})
+        self._parsed_files = {}
+        self._validating = set()
+
+    def validate(self, template, parameters=None, path=''):
+        errors = []
+        template = self._parse(template, path, errors)
+        if errors:
+            return errors
+        if not _is_mapping(template):
+            errors.append('%sThe template is not a JSON object or YAML '
+                          'mapping.' % path)
+            return errors
+
+        if 'heat_template_version' not in template:
+            for key, versions in CFN_VERSIONS.items():
+                if key in template:
+                    if str(template[key]) not in versions:
+                        errors.append(
+                            '%sThe template version is invalid: %s: %s' %
+                            (path, key, template[key]))
+                    # CloudFormation templates are left to Heat
+                    return errors
+            errors.append('%sThe template version is invalid: Template '
+                          'format version not found.' % path)
+            return errors
+
+        version = _version_string(template['heat_template_version'])
+        if version not in HOT_VERSIONS:
+            errors.append('%sThe template version is invalid: '
+                          'heat_template_version: %s' %
+                          (path, template['heat_template_version']))
+            return errors
+
+        _TemplateChecker(self, template, version, path, errors).check(
+            parameters)
+        return errors
+
+    def _parse(self, template, path, errors):
+        if isinstance(template, (str, bytes)):
+            try:
+                return template_format.parse(template)
+            except yaml.YAMLError as e:
+                errors.append('%sThe template could not be parsed: %s' %
+                              (path, e))
+                return None
+        return template
+
+    def nested_template(self, name):
+        """Return the parsed nested template of a files map entry."""
+        if name not in self._parsed_files:
+            errors = []
+            self._parsed_files[name] = self._parse(self.files[name],
+                                                   '', errors)
+        return self._parsed_files[name]
+
+    def resolve_type(self, resource_type, resource_name=None):
+        """Return a resource type as mapped by the resource_registry.
+
+        The result is either a files map entry or a type to look up in the
+        schemas. None is returned when the type is mapped to a template
+        that is not in the files map, e.g. a URL, as it can not be checked
+        locally.
+        """
+        per_resource = self.registry.get('resources') or {}
+        mapping = (per_resource.get(resource_name)
+                   if _is_mapping(per_resource) else None)
+        if _is_mapping(mapping) and isinstance(
+                mapping.get(resource_type), str):
+            resource_type = mapping[resource_type]
+        elif not self._is_mapped(resource_type):
+            return resource_type
+        seen = set()
+        while resource_type not in seen and self._is_mapped(resource_type):
+            seen.add(resource_type)
+            target = self.registry.get(resource_type)
+            if not isinstance(target, str):
+                target = self._resolve_glob(resource_type)
+            resource_type = target
+        if resource_type not in self.files and '::' not in resource_type:
+            return None
+        return resource_type
+
+    def _is_mapped(self, resource_type):
+        return (resource_type not in self.files and
+                (isinstance(self.registry.get(resource_type), str) or
+                 self._resolve_glob(resource_type) is not None))
+
+    def _resolve_glob(self, resource_type):
+        for pattern, target in self.registry.items():
+            if (isinstance(target, str) and pattern.endswith('*') and
+                    target.endswith('*') and
+                    resource_type.startswith(pattern[:-1])):
+                return target[:-1] + resource_type[len(pattern) - 1:]
+        return None
+
+    def validate_nested(self, name, errors):
+        if name in self._validating:
+            return
+        self._validating.add(name)
+        errors.extend(self.validate(self.files[name],
+                                    path='files.%s: ' % name))
+
+
+class _TemplateChecker(object):
+
+    def __init__(self, validator, template, version, path, errors):
+        self.validator = validator
+        self.template = template
+        self.version = version
+        self.path = path
+        self.errors = errors
+        self.parameters = template.get('parameters') or {}
+        self.resources = template.get('resources') or {}
+        self.conditions = template.get('conditions') or {}
+
+    def error(self, path, message):
+        self.errors.append('%s%s: %s' % (self.path, path, message))
+
+    def parameter_error(self, path, message):
+        """Report a missing parameter, only as a warning within outputs."""
+        if not path.startswith('outputs.'):
+            self.error(path, message)
+            return
+        LOG.warning('%s%s: %s', self.path, path, message)
+
+    def check(self, values):
+        for section in self.template:
+            if section not in SECTIONS:
+                self.error(section, 'The template section is invalid')
+        if 'conditions' in self.template and self.version < CONDITIONS_VERSION:
+            self.error('conditions', 'Conditions are not supported by '
+                       'heat_template_version %s' % self.version)
+        for section in ('parameters', 'resources', 'outputs', 'conditions'):
+            value = self.template.get(section)
+            if value is not None and not _is_mapping(value):
+                self.error(section, 'The section must be a mapping')
+                return
+
+        for name, param in self.parameters.items():
+            self.check_parameter(name, param)
+        self.check_parameter_groups(self.template.get('parameter_groups'))
+        for name, value in (values or {}).items():
+            if name in self.parameters and _is_mapping(self.parameters[name]):
+                self.check_value('parameters.%s' % name,
+                                 self.parameters[name], value)
+        for name, value in self.conditions.items():
+            self.check_functions('conditions.%s' % name, value)
+        for name, resource in self.resources.items():
+            self.check_resource(name, resource)
+        for name, output in (self.template.get('outputs') or {}).items():
+            path = 'outputs.%s' % name
+            if not _is_mapping(output) or 'value' not in output:
+                self.error(path, 'Each output must contain a value key.')
+                continue
+            self.check_functions(path + '.value', output['value'])
+
+    def check_parameter(self, name, param):
+        path = 'parameters.%s' % name
+        if not _is_mapping(param):
+            self.error(path, 'The parameter must be a mapping')
+            return
+        if 'type' not in param:
+            self.error(path, 'Missing parameter type for parameter: %s' %
+                       name)
+            return
+        if param['type'] not in PARAMETER_TYPES:
+            self.error(path, 'Invalid type (%s)' % param['type'])
+            return
+        for key in param:
+            if key not in PARAMETER_KEYS:
+                self.error(path, 'Invalid key \'%s\'' % key)
+        constraints = param.get('constraints') or []
+        if not _is_list(constraints):
+            self.error(path + '.constraints', 'The constraints must be a '
+                       'list')
+            return
+        for index, constraint in enumerate(constraints):
+            cpath = '%s.constraints[%d]' % (path, index)
+            kinds = [k for k in CONSTRAINT_TYPES
+                     if _is_mapping(constraint) and k in constraint]
+            if len(kinds) != 1:
+                self.error(cpath, 'Each constraint must have exactly one '
+                           'of %s' % ', '.join(CONSTRAINT_TYPES))
+        if 'default' in param:
+            self.check_value(path + '.default', param, param['default'])
+
+    def check_value(self, path, param, value):
+        param_type = param.get('type')
+        try:
+            value = self._coerce(param_type, value)
+        except ValueError as e:
+            self.error(path, 'Value \'%s\' is not a valid %s: %s' %
+                       (value, param_type, e))
+            return
+        for constraint in param.get('constraints') or []:
+            if not _is_mapping(constraint):
+                continue
+            try:
+                message = self._check_constraint(constraint, value)
+            except TypeError:
+                # The constraint does not apply to this type of parameter,
+                # leave it to Heat to report.
+                continue
+            if message:
+                self.error(path, constraint.get('description', message))
+
+    def _coerce(self, param_type, value):
+        if param_type == 'number':
+            if isinstance(value, bool):
+                raise ValueError('booleans are not numbers')
+            if isinstance(value, numbers.Number):
+                return value
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return float(value)
+        if param_type == 'boolean':
+            if isinstance(value, bool):
+                return value
+            return strutils.bool_from_string(str(value), strict=True)
+        if param_type == 'comma_delimited_list':
+            if isinstance(value, str):
+                return [v.strip() for v in value.split(',')] if value else []
+            if _is_list(value):
+                return list(value)
+            raise ValueError('not a list')
+        if param_type == 'json':
+            if isinstance(value, str):
+                return json.loads(value) if value else {}
+            if _is_mapping(value) or _is_list(value):
+                return value
+            raise ValueError('not a JSON value')
+        if _is_mapping(value) or _is_list(value):
+            raise ValueError('not a string')
+        return str(value)
+
+    def _check_constraint(self, constraint, value):
+        if 'length' in constraint:
+            limits = constraint['length'] or {}
+            length = len(value)
+            if 'min' in limits and length < limits['min']:
+                return 'length must be at least %s.' % limits['min']
+            if 'max' in limits and length > limits['max']:
+                return 'length must be no greater than %s.' % limits['max']
+        elif 'range' in constraint:
+            limits = constraint['range'] or {}
+            if 'min' in limits and value < limits['min']:
+                return '%s must be at least %s.' % (value, limits['min'])
+            if 'max' in limits and value > limits['max']:
+                return '%s must be no greater than %s.' % (
+                    value, limits['max'])
+        elif 'modulo' in constraint:
+            modulo = constraint['modulo'] or {}
+            step = modulo.get('step')
+            if step and (value - modulo.get('offset', 0)) % step:
+                return '%s is not a multiple of %s with an offset of %s.' % (
+                    value, step, modulo.get('offset', 0))
+        elif 'allowed_values' in constraint:
+            allowed = list(constraint['allowed_values'] or [])
+            values = value if _is_list(value) else [value]
+            for v in values:
+                if v not in allowed and str(v) not in map(str, allowed):
+                    return '"%s" is not an allowed value %s' % (v, allowed)
+        elif 'allowed_pattern' in constraint:
+            pattern = constraint['allowed_pattern']
+            if not re.fullmatch(pattern, str(value)):
+                return '"%s" does not match pattern "%s"' % (value, pattern)
+        return None
+
+    def check_parameter_groups(self, groups):
+        if groups is None:
+            return
+        if not _is_list(groups):
+            self.error('parameter_groups', 'The parameter groups must be '
+                       'a list')
+            return
+        for index, group in enumerate(groups):
+            path = 'parameter_groups[%d]' % index
+            if not _is_mapping(group) or not _is_list(
+                    group.get('parameters')):
+                self.error(path, 'Parameters must be provided for each '
+                           'Parameter Group.')
+                continue
+            for name in group['parameters']:
+                if name not in self.parameters:
+                    self.error(path, 'The grouped parameter %s does not '
+                               'reference a valid parameter.' % name)
+
+    def check_resource(self, name, resource):
+        path = 'resources.%s' % name
+        if not _is_mapping(resource):
+            self.error(path, 'Resource definition must be a mapping')
+            return
+        if not isinstance(resource.get('type'), str):
+            self.error(path, 'Resource definition must have a type')
+            return
+        for key in resource:
+            if key not in RESOURCE_KEYS:
+                self.error(path, '"%s" is not a valid keyword inside a '
+                           'resource definition' % key)
+        depends_on = resource.get('depends_on') or []
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        for dep in depends_on:
+            if dep not in self.resources:
+                self.error(path + '.depends_on', 'The specified reference '
+                           '"%s" (in %s) is incorrect.' % (dep, name))
+        if resource.get('deletion_policy', 'Delete') not in DELETION_POLICIES:
+            self.error(path + '.deletion_policy', 'Invalid deletion policy '
+                       '"%s"' % resource['deletion_policy'])
+        condition = resource.get('condition')
+        if isinstance(condition, str) and condition not in self.conditions:
+            self.error(path + '.condition', 'Invalid condition "%s"' %
+                       condition)
+
+        properties = resource.get('properties') or {}
+        if not _is_mapping(properties):
+            self.error(path + '.properties', 'The properties must be a '
+                       'mapping')
+            return
+        for key in ('properties', 'metadata', 'update_policy'):
+            if key in resource:
+                self.check_functions('%s.%s' % (path, key), resource[key])
+        self.check_resource_type(path, name, resource['type'], properties)
+
+    def check_resource_type(self, path, name, resource_type, properties):
+        validator = self.validator
+        resolved = validator.resolve_type(resource_type, name)
+        if resolved is None:
+            return
+        resource_type = resolved
+        if resource_type in validator.files:
+            nested = validator.nested_template(resource_type)
+            if _is_mapping(nested):
+                validator.validate_nested(resource_type, self.errors)
+                params = nested.get('parameters') or {}
+                if _is_mapping(params):
+                    # parameter_defaults apply to the nested stacks too
+                    schema = dict(
+                        (name, {'required': _is_mapping(param) and
+                                'default' not in param and
+                                name not in validator.parameter_defaults})
+                        for name, param in params.items())
+                    self.check_properties(path, schema, properties)
+            return
+        if validator.schemas is None:
+            return
+        schema = validator.schemas.get(resource_type)
+        if schema is None:
+            self.error(path, 'The Resource Type (%s) could not be found.' %
+                       resource_type)
+            return
+        self.check_properties(path, schema.get('properties') or {},
+                              properties)
+
+    def check_properties(self, path, schema, properties):
+        for key in properties:
+            if key not in schema:
+                self.error('%s.properties' % path,
+                           'Unknown Property %s' % key)
+        for key, prop in schema.items():
+            if prop.get('required') and key not in properties:
+                self.error('%s.properties' % path,
+                           'Property %s not assigned' % key)
+
+    def attribute_names(self, resource_name):
+        """Return the attributes of a resource, or None if unknown."""
+        resource = self.resources.get(resource_name)
+        resource_type = _is_mapping(resource) and resource.get('type')
+        if not isinstance(resource_type, str):
+            return None
+        resource_type = self.validator.resolve_type(resource_type,
+                                                    resource_name)
+        if resource_type is None or resource_type in DYNAMIC_ATTRIBUTE_TYPES:
+            return None
+        if resource_type in self.validator.files:
+            nested = self.validator.nested_template(resource_type)
+            if not _is_mapping(nested):
+                return None
+            outputs = nested.get('outputs') or {}
+            # Attributes of the nested resources are available as
+            # resource.<name>
+            return (set(outputs) | {'OS::stack_id'} |
+                    set('resource.%s' % name
+                        for name in nested.get('resources') or {}))
+        if self.validator.schemas is None:
+            return None
+        schema = self.validator.schemas.get(resource_type)
+        if schema is None:
+            return None
+        return set(schema.get('attributes') or {})
+
+    def check_functions(self, path, value):
+        """Check the intrinsic functions used in a snippet, recursively."""
+        if _is_list(value):
+            for index, item in enumerate(value):
+                self.check_functions('%s[%d]' % (path, index), item)
+            return
+        if not _is_mapping(value):
+            return
+        if len(value) == 1:
+            fn_name = next(iter(value))
+            if fn_name in FUNCTION_VERSIONS:
+                args = value[fn_name]
+                if self.version < FUNCTION_VERSIONS[fn_name]:
+                    self.error(path, '"%s" is not supported by '
+                               'heat_template_version %s' %
+                               (fn_name, self.version))
+                checker = getattr(self, '_check_%s' % fn_name, None)
+                if checker is not None:
+                    checker(path, args)
+                self.check_functions(path, args)
+                return
+        for key, item in value.items():
+            self.check_functions('%s.%s' % (path, key), item)
+
+    def _check_get_param(self, path, args):
+        name = args[0] if _is_list(args) and args else args
+        if not isinstance(name, str):
+            if not _is_mapping(name):
+                self.error(path, 'Arguments to "get_param" must be of the '
+                           'form [param_name, path1, ..., pathN]')
+            return
+        if name not in self.parameters and name not in PSEUDO_PARAMETERS:
+            self.parameter_error(path, 'The Parameter (%s) was not '
+                                 'provided.' % name)
+
+    def _check_get_resource(self, path, args):
+        if isinstance(args, str):
+            if args not in self.resources:
+                self.error(path, 'The specified reference "%s" is '
+                           'incorrect.' % args)
+        elif not _is_mapping(args):
+            self.error(path, 'Argument to "get_resource" must be a string')
+
+    def _check_get_attr(self, path, args):
+        if not _is_list(args) or len(args) < 1:
+            self.error(path, 'Arguments to "get_attr" must be of the form '
+                       '[resource_name, attribute, (path), ...]')
+            return
+        name = args[0]
+        if not isinstance(name, str):
+            return
+        if name not in self.resources:
+            self.error(path, 'The specified reference "%s" is incorrect.' %
+                       name)
+            return
+        if len(args) < 2:
+            if self.version < '2015-10-15':
+                self.error(path, 'Arguments to "get_attr" must be of the '
+                           'form [resource_name, attribute, (path), ...]')
+            return
+        attribute = args[1]
+        names = self.attribute_names(name)
+        if (isinstance(attribute, str) and names is not None and
+                attribute != 'show' and attribute not in names):
+            self.error(path, 'The Referenced Attribute (%s %s) is '
+                       'incorrect.' % (name, attribute))
+
+    def _check_get_file(self, path, args):
+        if not isinstance(args, str):
+            self.error(path, 'Argument to "get_file" must be a string')
+        elif self.validator.files and args not in self.validator.files:
+            self.error(path, 'No content found in the "files" section for '
+                       'get_file path: %s' % args)
+
+    def _check_list_join(self, path, args):
+        if (not _is_list(args) or len(args) < 2 or
+                not isinstance(args[0], str)):
+            self.error(path, 'Incorrect arguments to "list_join" should '
+                       'be: {"list_join": [delimiter, [item, ...]]}')
+
+    def _check_str_replace(self, path, args):
+        if not _is_mapping(args) or 'template' not in args or (
+                'params' not in args):
+            self.error(path, 'Arguments to "str_replace" must be a mapping '
+                       'with template and params keys')
+        elif not _is_mapping(args['params']):
+            self.error(path, '"str_replace" params must be a mapping')
+
+    _check_str_replace_strict = _check_str_replace
+    _check_str_replace_vstrict = _check_str_replace
+
+    def _check_repeat(self, path, args):
+        if not _is_mapping(args) or 'for_each' not in args or (
+                'template' not in args):
+            self.error(path, 'Arguments to "repeat" must be a map with '
+                       'for_each and template keys')
+
+    def _check_if(self, path, args):
+        if not _is_list(args) or len(args) not in (2, 3):
+            self.error(path, 'Arguments to "if" must be of the form '
+                       '[condition_name, value_if_true, value_if_false]')
+        elif isinstance(args[0], str) and args[0] not in self.conditions:
+            self.error(path, 'Invalid condition "%s"' % args[0])
+
+    def _check_equals(self, path, args):
+        if not _is_list(args) or len(args) != 2:
+            self.error(path, 'Arguments to "equals" must be of the form '
+                       '[value_1, value_2]')
@@ -12,25 +12,30 @@
 
 import random
 import re
-import subprocess
 import time
 
 from heatclient import exc as heat_exceptions
 from keystoneauth1 import exceptions as kc_exceptions
+from novaclient import exceptions as nova_exceptions
 from oslo_log import log as logging
 from oslo_utils import timeutils
 import testscenarios
 import testtools
-import urllib
 
+from heat_tempest_plugin.common import console
 from heat_tempest_plugin.common import exceptions
+from heat_tempest_plugin.common import probes
 from heat_tempest_plugin.common import remote_client
+from heat_tempest_plugin.common import template_builder
+from heat_tempest_plugin.common import template_validator
 from heat_tempest_plugin.services import clients
 from tempest import config
 from tempest import test
 
 LOG = logging.getLogger(__name__)
 _resource_types = None
+# Heat's default max_nested_stack_depth
+MAX_NESTED_DEPTH = 5
 
 
 def call_until_true(duration, sleep_for, func, *args, **kwargs):
@@ -57,6 +62,21 @@ def call_until_true(duration, sleep_for, func, *args, **kwargs):
     return False
 
 
+def serialise_template(template):
+    """Return a template in a form heatclient can send.
+
+    Frozen templates are sent as their cached JSON serialisation.
+    """
+    if isinstance(template, template_builder.FrozenMap):
+        return template.to_json()
+    return template
+
+
+def serialise_files(files):
+    return dict((name, serialise_template(content))
+                for name, content in (files or {}).items())
+
+
 def isotime(at):
     if at is None:
         return None
@@ -96,8 +116,8 @@ def requires_resource_type(resource_type):
         global _resource_types
         if not _resource_types:
             manager = clients.ClientManager(conf)
-            obj_rtypes = manager.orchestration_client.resource_types.list()
-            _resource_types = list(t.resource_type for t in obj_rtypes)
+            _resource_types = template_validator.ResourceTypeSchemas(
+                manager.orchestration_client).names()
         rtype_available = resource_type and resource_type in _resource_types
         skipper = testtools.skipUnless(
             rtype_available,
@@ -197,6 +217,11 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
             self.verify_cert = False
         else:
             self.verify_cert = self.conf.ca_file or True
+        # Interval between status checks while waiting for stacks,
+        # resources and events
+        self.build_interval = self.conf.build_interval
+        self.stack_identifiers = []
+        self.console_tailer = console.ConsoleTailer()
 
     def setup_plugin_clients(self, conf, admin_credentials=False):
         self.manager = clients.ClientManager(conf, admin_credentials)
@@ -223,6 +248,7 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
         linux_client = remote_client.RemoteClient(ip, username,
                                                   pkey=private_key,
                                                   conf=self.conf)
+        self.addCleanup(linux_client.close)
         try:
             linux_client.validate_authentication()
         except exceptions.SSHTimeout:
@@ -231,28 +257,58 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
 
         return linux_client
 
-    def check_connectivity(self, check_ip):
-        def try_connect(ip):
-            try:
-                urllib.request.urlopen('http://%s/' % ip)
-                return True
-            except IOError:
-                return False
+    def check_connectivity(self, *check_ips):
+        """Wait until a web server answers on every one of check_ips.
+
+        The addresses are probed concurrently.
 
-        timeout = self.conf.connectivity_timeout
-        elapsed_time = 0
-        while not try_connect(check_ip):
-            time.sleep(10)
-            elapsed_time += 10
-            if elapsed_time > timeout:
-                raise exceptions.TimeoutException()
+        :returns: dict mapping each address to the number of seconds it took
+                  to respond.
+        """
+        urls = dict(('http://%s/' % ip, ip) for ip in check_ips)
+        results = probes.probe_http(
+            urls, timeout=self.conf.connectivity_timeout)
+        unreachable = [urls[url] for url, elapsed in results.items()
+                       if elapsed is None]
+        if unreachable:
+            raise exceptions.TimeoutException(
+                'No response from %s' % ', '.join(unreachable))
+        return dict((urls[url], elapsed) for url, elapsed in results.items())
+
+    def _stack_servers(self):
+        """Return the servers belonging to the stacks of this test."""
+        servers = []
+        for stack_identifier in self.stack_identifiers:
+            try:
+                resources = self.client.resources.list(
+                    stack_identifier, nested_depth=MAX_NESTED_DEPTH,
+                    filters={'type': 'OS::Nova::Server'})
+            except heat_exceptions.HTTPNotFound:
+                continue
+            for res in resources:
+                if not res.physical_resource_id:
+                    continue
+                try:
+                    servers.append(self.compute_client.servers.get(
+                        res.physical_resource_id))
+                except nova_exceptions.NotFound:
+                    pass
+        return servers
 
     def _log_console_output(self, servers=None):
+        """Log the console lines of servers not logged before.
+
+        Without servers, the servers of the stacks created by this test are
+        used.
+        """
         if not servers:
-            servers = self.compute_client.servers.list()
+            servers = self._stack_servers()
+        new_lines = self.console_tailer.tail_many(servers)
         for server in servers:
-            LOG.info('Console output for %s', server.id)
-            LOG.info(server.get_console_output())
+            LOG.info('Console output for %s (boot stages seen: %s)',
+                     server.id, ', '.join(sorted(
+                         self.console_tailer.progress(server.id))))
+            LOG.info('\n'.join(new_lines[server.id]))
 
     def create_keypair(self, client=None, name=None):
         if client is None:
@@ -302,18 +358,24 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
                 value = o['output_value']
         return value
 
-    def _ping_ip_address(self, ip_address, should_succeed=True):
-        cmd = ['ping', '-c1', '-w1', ip_address]
+    def check_template(self, template, files=None, parameters=None,
+                       environment=None):
+        """Check a template locally, without calling the Heat API.
 
-        def ping():
-            proc = subprocess.Popen(cmd,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE)
-            proc.wait()
-            return (proc.returncode == 0) == should_succeed
+        Resource types and properties are checked against the schemas
+        reported by Heat, which are fetched once per process, after mapping
+        them through the resource_registry of the environment. Raises
+        TemplateValidationError if the template is obviously invalid, Heat
+        may still reject a template that passes.
+        """
+        template_validator.check(
+            template, serialise_files(files), parameters,
+            template_validator.ResourceTypeSchemas(self.client),
+            environment)
 
-        return call_until_true(
-            self.conf.build_timeout, 1, ping)
+    def _ping_ip_address(self, ip_address, should_succeed=True):
+        return probes.ping([ip_address], self.conf.build_timeout,
+                           should_succeed)[ip_address]
 
     def _wait_for_all_resource_status(self, stack_identifier,
                                       status, failure_pattern='^.*_FAILED$',
@@ -330,7 +392,7 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
         """Waits for a Resource to reach a given status."""
         fail_regexp = re.compile(failure_pattern)
         build_timeout = self.conf.build_timeout
-        build_interval = self.conf.build_interval
+        build_interval = self.build_interval
 
         start = timeutils.utcnow()
         while timeutils.delta_seconds(start,
@@ -410,7 +472,7 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
         else:
             fail_regexp = re.compile('^.*_FAILED$')
         build_timeout = self.conf.build_timeout
-        build_interval = self.conf.build_interval
+        build_interval = self.build_interval
 
         start = timeutils.utcnow()
         while timeutils.delta_seconds(start,
@@ -448,7 +510,7 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
 
     def _handle_in_progress(self, fn, *args, **kwargs):
         build_timeout = self.conf.build_timeout
-        build_interval = self.conf.build_interval
+        build_interval = self.build_interval
         start = timeutils.utcnow()
         while timeutils.delta_seconds(start,
                                       timeutils.utcnow()) < build_timeout:
@@ -470,13 +532,13 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
                      disable_rollback=True,
                      existing=False):
         env = environment or {}
-        env_files = files or {}
+        env_files = serialise_files(files)
         parameters = parameters or {}
 
         self._handle_in_progress(
             self.client.stacks.update,
             stack_id=stack_identifier,
-            template=template,
+            template=serialise_template(template),
             files=env_files,
             disable_rollback=disable_rollback,
             parameters=parameters,
@@ -520,12 +582,12 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
                              tags=None, disable_rollback=True,
                              show_nested=False):
         env = environment or {}
-        env_files = files or {}
+        env_files = serialise_files(files)
         parameters = parameters or {}
 
         return self.client.stacks.preview_update(
             stack_id=stack_identifier,
-            template=template,
+            template=serialise_template(template),
             files=env_files,
             disable_rollback=disable_rollback,
             parameters=parameters,
@@ -611,8 +673,23 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
 
     def get_stack_output(self, stack_identifier, output_key,
                          validate_errors=True):
-        stack = self.client.stacks.get(stack_identifier)
-        return self._stack_output(stack, output_key, validate_errors)
+        """Return the value of a single stack output.
+
+        Only the requested output is resolved, using the output show API.
+        If it is not available, or the output is not found, the stack is
+        shown with all its outputs resolved instead.
+        """
+        try:
+            output = self.client.stacks.output_show(
+                stack_identifier, output_key)['output']
+        except heat_exceptions.HTTPNotFound:
+            stack = self.client.stacks.get(stack_identifier)
+            return self._stack_output(stack, output_key, validate_errors)
+        if validate_errors and 'output_error' in output:
+            raise ValueError(
+                'Unexpected output errors in %s : %s' % (
+                    output_key, output['output_error']))
+        return output['output_value']
 
     def check_input_values(self, group_resources, key, value):
         # Check inputs for deployment and derived config
@@ -638,8 +715,8 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
                      disable_rollback=True, enable_cleanup=True,
                      environment_files=None, timeout=None):
         name = stack_name or self._stack_rand_name()
-        templ = template or self.template
-        templ_files = files or {}
+        templ = serialise_template(template or self.template)
+        templ_files = serialise_files(files)
         params = parameters or {}
         env = environment or {}
         timeout_mins = timeout or self.conf.build_timeout
@@ -659,6 +736,7 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
 
         stack = self.client.stacks.get(name, resolve_outputs=False)
         stack_identifier = '%s/%s' % (name, stack.id)
+        self.stack_identifiers.append(stack_identifier)
         kwargs = {'stack_identifier': stack_identifier,
                   'status': expected_status}
         if expected_status:
@@ -676,7 +754,7 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
                 'ADOPT' in self.conf.skip_test_stack_action_list):
             self.skipTest('Testing Stack adopt disabled in conf, skipping')
         name = stack_name or self._stack_rand_name()
-        templ_files = files or {}
+        templ_files = serialise_files(files)
         params = parameters or {}
         env = environment or {}
         self.client.stacks.create(
@@ -690,6 +768,7 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
         self.addCleanup(self._stack_delete, name)
         stack = self.client.stacks.get(name, resolve_outputs=False)
         stack_identifier = '%s/%s' % (name, stack.id)
+        self.stack_identifiers.append(stack_identifier)
         self._wait_for_stack_status(stack_identifier, wait_for_status)
         return stack_identifier
 
@@ -737,7 +816,7 @@ class HeatIntegrationTest(test.BaseTestCase, testscenarios.WithScenarios):
     def wait_for_event_with_reason(self, stack_identifier, reason,
                                    rsrc_name=None, num_expected=1):
         build_timeout = self.conf.build_timeout
-        build_interval = self.conf.build_interval
+        build_interval = self.build_interval
         start = timeutils.utcnow()
         while timeutils.delta_seconds(start,
                                       timeutils.utcnow()) < build_timeout:
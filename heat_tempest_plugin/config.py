@@ -189,3 +189,151 @@ HeatFeaturesGroup = [
                 default=False,
                 help="If false, skip multi-cloud tests for remote stack")
 ]
+
+heat_benchmark_group = cfg.OptGroup(
+    name='heat_benchmark',
+    title="Orchestration Service Benchmark Options")
+
+HeatBenchmarkGroup = [
+    cfg.BoolOpt('skip_benchmark_tests',
+                default=True,
+                help="Skip all benchmark tests. Benchmarks create many "
+                     "stacks and take a long time, so they are disabled "
+                     "unless explicitly enabled."),
+    cfg.ListOpt('skip_benchmark_test_list',
+                help="List of benchmark test class or class.method "
+                     "names to skip ex. TemplateScalingBenchmark, "
+                     "TemplateScalingBenchmark.test_flat_template"),
+    cfg.StrOpt('results_file',
+               help="File to append benchmark results to, one JSON "
+                    "object per line. Results are always attached to the "
+                    "test details and logged."),
+    cfg.StrOpt('cloud_name',
+               help="Name of the cloud under test, added to every result so "
+                    "that results from different clouds can be compared."),
+    cfg.StrOpt('engine_mode',
+               default='auto',
+               choices=['auto', 'convergence', 'legacy'],
+               help="Heat engine mode of the cloud under test, added to "
+                    "every result. With auto, it is derived from "
+                    "[heat_plugin] convergence_engine_enabled."),
+    cfg.FloatOpt('poll_interval',
+                 default=0.5,
+                 min=0,
+                 help="Time in seconds between status checks in benchmark "
+                      "tests. This is usually lower than build_interval "
+                      "so that the measured latencies are accurate."),
+    cfg.IntOpt('repetitions',
+               default=5,
+               min=1,
+               help="Number of times read-only requests are repeated to "
+                    "measure the distribution of their latency."),
+    cfg.ListOpt('template_sizes',
+                item_type=cfg.types.Integer(min=1),
+                default=[10, 50, 100, 200],
+                help="Numbers of resources of the generated templates "
+                     "used by the template scaling benchmarks."),
+    cfg.ListOpt('concurrency_levels',
+                item_type=cfg.types.Integer(min=1),
+                default=[1, 2, 4, 8, 16],
+                help="Numbers of concurrent requests in flight at each step "
+                     "of the throughput benchmarks."),
+    cfg.IntOpt('stacks_per_worker',
+               default=2,
+               min=1,
+               help="Number of stacks each concurrent worker creates at "
+                    "each step of the stack create throughput benchmark."),
+    cfg.IntOpt('throughput_stack_size',
+               default=5,
+               min=1,
+               help="Number of OS::Heat::TestResource resources of the "
+                    "stacks created by the throughput benchmark."),
+    cfg.FloatOpt('resource_wait_secs',
+                 default=1.0,
+                 min=0,
+                 help="Value of the wait_secs property of the "
+                      "OS::Heat::TestResource resources created by the "
+                      "throughput benchmark, simulating slow resources."),
+    cfg.ListOpt('stack_list_counts',
+                item_type=cfg.types.Integer(min=1),
+                default=[100, 250, 500],
+                help="Numbers of stacks the project is seeded with before "
+                     "measuring the stack list latency. Seeding stops at "
+                     "the max_stacks_per_tenant quota of heat, 512 by "
+                     "default, raise it to measure larger counts."),
+    cfg.IntOpt('page_size',
+               default=20,
+               min=1,
+               help="Page size (limit) of the paginated lists of stacks "
+                    "and events."),
+    cfg.IntOpt('seed_concurrency',
+               default=10,
+               min=1,
+               help="Number of stacks created or deleted concurrently when "
+                    "seeding a project for a benchmark."),
+    cfg.ListOpt('event_history_sizes',
+                item_type=cfg.types.Integer(min=1),
+                default=[100, 500, 1000, 2000],
+                help="Numbers of events the event benchmark grows the "
+                     "history of a stack to, by updating it repeatedly. "
+                     "The history is capped by the max_events_per_stack "
+                     "option of heat."),
+    cfg.IntOpt('event_stack_size',
+               default=10,
+               min=1,
+               help="Number of resources of the stack, and of its nested "
+                    "stack, updated by the event benchmark."),
+    cfg.ListOpt('nested_depths',
+                item_type=cfg.types.Integer(min=1),
+                default=[1, 2, 3, 4, 5],
+                help="Depths of the trees of nested stacks created by the "
+                     "nested stack benchmark. Depths greater than the "
+                     "max_nested_stack_depth option of heat fail."),
+    cfg.ListOpt('nested_fan_outs',
+                item_type=cfg.types.Integer(min=1),
+                default=[1, 2, 4],
+                help="Numbers of child stacks of every stack in the trees "
+                     "created by the nested stack benchmark."),
+    cfg.IntOpt('nested_max_stacks',
+               default=200,
+               min=1,
+               help="Combinations of nested_depths and nested_fan_outs "
+                    "resulting in more nested stacks than this are "
+                    "skipped."),
+    cfg.ListOpt('deployment_counts',
+                item_type=cfg.types.Integer(min=1),
+                default=[5, 20, 50],
+                help="Numbers of software deployments to a single server "
+                     "measured by the software deployment benchmark."),
+    cfg.ListOpt('deployment_config_sizes',
+                item_type=cfg.types.Integer(min=1),
+                default=[1000, 10000, 100000],
+                help="Sizes in bytes of the software configs deployed by "
+                     "the software deployment benchmark."),
+    cfg.ListOpt('deployment_config_stacks',
+                item_type=cfg.types.Integer(min=1),
+                default=[1, 3, 5],
+                help="Numbers of config stacks created concurrently by the "
+                     "software deployment benchmark, the deployments are "
+                     "spread across them."),
+    cfg.IntOpt('signal_concurrency',
+               default=10,
+               min=1,
+               help="Number of signals sent concurrently by the signal "
+                    "throughput benchmarks."),
+    cfg.ListOpt('wait_condition_counts',
+                item_type=cfg.types.Integer(min=1),
+                default=[100, 500, 1000],
+                help="Numbers of signals expected by the wait conditions of "
+                     "the wait condition signal benchmark."),
+    cfg.IntOpt('engine_stack_size',
+               default=20,
+               min=1,
+               help="Number of OS::Heat::TestResource resources of the "
+                    "stacks of the engine comparison benchmark."),
+    cfg.ListOpt('output_counts',
+                item_type=cfg.types.Integer(min=1),
+                default=[1, 10, 50, 100],
+                help="Numbers of outputs of the stacks of the output "
+                     "resolution benchmark."),
+]
@@ -61,6 +61,8 @@ class HeatTempestPlugin(plugins.TempestPlugin):
                                   heat_config.HeatGroup)
         config.register_opt_group(conf, heat_config.heat_features_group,
                                   heat_config.HeatFeaturesGroup)
+        config.register_opt_group(conf, heat_config.heat_benchmark_group,
+                                  heat_config.HeatBenchmarkGroup)
 
     def get_opt_lists(self):
         """Get a list of options for sample config generation
@@ -75,4 +77,6 @@ class HeatTempestPlugin(plugins.TempestPlugin):
                 (heat_config.heat_group.name,
                  heat_config.HeatGroup),
                 (heat_config.heat_features_group.name,
-                 heat_config.HeatFeaturesGroup)]
+                 heat_config.HeatFeaturesGroup),
+                (heat_config.heat_benchmark_group.name,
+                 heat_config.HeatBenchmarkGroup)]
@@ -0,0 +1,134 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Custom gabbi response handlers for the Heat API tests."""
+
+import re
+import time
+
+from gabbi.handlers import base
+from gabbi.handlers import jsonhandler
+from gabbi import utils
+import httpx
+from oslo_log import log as logging
+from tempest import config
+
+LOG = logging.getLogger(__name__)
+
+# Per-test list of (attempt, elapsed seconds, matched) tuples recorded by
+# PollJSONPathsHandler, keyed by the gabbi test name, for reporting.
+POLL_TIMINGS = {}
+
+
+class PollJSONPathsHandler(base.ResponseHandler):
+    """Re-issue a request until its JSONPaths match.
+
+    ``response_poll_json_paths`` takes the same mapping as
+    ``response_json_paths``, but rather than polling with a fixed count and
+    delay it repeats the request with an exponential backoff, starting at
+    ``initial_delay`` and capped at ``build_interval``, until every path
+    matches or ``build_timeout`` elapses. The handler returns as soon as the
+    paths match, so a test only waits as long as Heat takes, and fails as
+    soon as a polled value reaches a ``*_FAILED`` status. Like gabbi's own
+    poll, a refused connection or a read timeout counts as a failed
+    attempt. Every attempt is recorded in POLL_TIMINGS.
+    """
+
+    test_key_suffix = 'poll_json_paths'
+    test_key_value = {}
+
+    initial_delay = 0.1
+    backoff_factor = 2
+    failure_pattern = re.compile('_FAILED$')
+    retried_errors = (utils.ConnectionRefused, httpx.ReadTimeout)
+
+    def __init__(self):
+        super(PollJSONPathsHandler, self).__init__()
+        self._json_handler = jsonhandler.JSONHandler()
+
+    def __call__(self, test):
+        paths = test.test_data[self._key]
+        if not paths:
+            return
+
+        conf = config.CONF.heat_plugin
+        deadline = time.time() + conf.build_timeout
+        delay = self.initial_delay
+        name = test.test_data['name']
+        timings = POLL_TIMINGS[name] = []
+        start = time.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if attempt > 1:
+                    self._rerun_request(test)
+                for path, value in paths.items():
+                    self._json_handler.action(test, path, value)
+            except self.retried_errors as e:
+                self._record(timings, name, attempt, start, False)
+                if time.time() + delay > deadline:
+                    LOG.info("Polling '%s' gave up after %d attempts "
+                             "(%.2f s): %s", name, attempt,
+                             time.time() - start, e)
+                    raise
+            except AssertionError:
+                self._record(timings, name, attempt, start, False)
+                failed = self._failed_value(test, paths)
+                if failed is not None:
+                    LOG.info("Polling '%s' stopped after %d attempts "
+                             "(%.2f s), the status is %s", name, attempt,
+                             time.time() - start, failed)
+                    raise
+                if time.time() + delay > deadline:
+                    LOG.info("Polling '%s' gave up after %d attempts "
+                             "(%.2f s)", name, attempt, time.time() - start)
+                    raise
+            else:
+                self._record(timings, name, attempt, start, True)
+                LOG.info("Polling '%s' matched after %d attempts (%.2f s)",
+                         name, attempt, time.time() - start)
+                return
+
+            time.sleep(delay)
+            delay = min(delay * self.backoff_factor, conf.build_interval)
+
+    @staticmethod
+    def _record(timings, name, attempt, start, matched):
+        elapsed = time.time() - start
+        timings.append((attempt, elapsed, matched))
+        LOG.debug("Polling '%s' attempt %d (%.2f s): %s", name, attempt,
+                  elapsed, 'matched' if matched else 'not matched')
+
+    def _failed_value(self, test, paths):
+        """Return the first polled value that is a failed status, if any."""
+        for path in paths:
+            try:
+                value = self._json_handler.extract_json_path_value(
+                    test.response_data, test.replace_template(path))
+            except (AttributeError, ValueError):
+                continue
+            if (isinstance(value, str) and
+                    self.failure_pattern.search(value)):
+                return value
+        return None
+
+    @staticmethod
+    def _rerun_request(test):
+        test._run_request(test._parse_url(test.url),
+                          test.test_data['method'].upper(),
+                          test._format_headers_for_httpx(
+                              test.test_data['request_headers']),
+                          b'',
+                          redirect=test.test_data['redirects'],
+                          timeout=test.test_data['timeout'])
@@ -25,6 +25,7 @@ from tempest import config
 from heat_tempest_plugin.common import test
 from heat_tempest_plugin.services import clients
 from heat_tempest_plugin.tests.api import fixtures
+from heat_tempest_plugin.tests.api import handlers
 
 LOG = logging.getLogger(__name__)
 TESTS_DIR = 'gabbits'
@@ -96,6 +97,8 @@ def load_tests(loader, tests, pattern):
     try:
         api_tests = driver.build_tests(test_dir, loader, url=endpoint, host="",
                                        fixture_module=fixtures,
+                                       response_handlers=[
+                                           handlers.PollJSONPathsHandler],
                                        cert_validate=cert_validate,
                                        test_loader_name=__name__)
     except TypeError as ex:
@@ -104,6 +107,8 @@ def load_tests(loader, tests, pattern):
             api_tests = driver.build_tests(test_dir, loader,
                                            url=endpoint, host="",
                                            fixture_module=fixtures,
+                                           response_handlers=[
+                                               handlers.PollJSONPathsHandler],
                                            test_loader_name=__name__)
         else:
             raise
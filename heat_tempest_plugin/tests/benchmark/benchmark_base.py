@@ -0,0 +1,163 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+import datetime
+import json
+import math
+import threading
+import time
+
+from oslo_log import log as logging
+from oslo_utils import reflection
+from tempest import config
+from testtools import content
+
+from heat_tempest_plugin.common import remote_client
+from heat_tempest_plugin.common import test
+
+LOG = logging.getLogger(__name__)
+_results_file_lock = threading.Lock()
+
+
+def percentile(values, pct):
+    """Return the pct percentile of values, using the nearest rank."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = int(math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[max(rank, 1) - 1]
+
+
+def summarise(values):
+    """Return the count, extremes, mean and percentiles of values."""
+    values = list(values)
+    if not values:
+        return {'count': 0}
+    return {'count': len(values),
+            'min': min(values),
+            'max': max(values),
+            'mean': sum(values) / len(values),
+            'p50': percentile(values, 50),
+            'p95': percentile(values, 95),
+            'p99': percentile(values, 99)}
+
+
+class BenchmarkTestsBase(test.HeatIntegrationTest):
+    """Base class of the benchmark tests.
+
+    Benchmarks record their measurements with record() and measure(). At
+    the end of each test the results are attached to the test details as
+    JSON lines, logged, and appended to [heat_benchmark] results_file if
+    it is set. Every result is tagged with the cloud name, region and
+    engine mode, so that results from different clouds can be compared.
+    """
+
+    def setUp(self):
+        super(BenchmarkTestsBase, self).setUp()
+        self.benchmark_conf = config.CONF.heat_benchmark
+        self.check_skip()
+        self.build_interval = self.benchmark_conf.poll_interval
+        self.results = []
+        self.default_tags = {'cloud': self.benchmark_conf.cloud_name,
+                             'region': self.conf.region,
+                             'engine_mode': self.engine_mode()}
+        self.addCleanup(self._emit_results)
+
+    def engine_mode(self):
+        """Return 'convergence' or 'legacy', the engine mode of the cloud.
+
+        The Heat API does not report which engine handles a stack, so the
+        mode is taken from the configuration.
+        """
+        mode = self.benchmark_conf.engine_mode
+        if mode == 'auto':
+            if self.conf.convergence_engine_enabled:
+                return 'convergence'
+            return 'legacy'
+        return mode
+
+    def check_skip(self):
+        test_cls_name = reflection.get_class_name(self, fully_qualified=False)
+        test_method_name = '.'.join([test_cls_name, self._testMethodName])
+        skip_list = self.benchmark_conf.skip_benchmark_test_list
+        test_skipped = (skip_list and (test_cls_name in skip_list or
+                                       test_method_name in skip_list))
+
+        if self.benchmark_conf.skip_benchmark_tests or test_skipped:
+            self.skipTest('Test disabled in conf, skipping')
+
+    def record(self, metric, value, unit='s', **tags):
+        """Record a single measurement, tagged with arbitrary values."""
+        result = {'test': self.id(),
+                  'metric': metric,
+                  'value': value,
+                  'unit': unit,
+                  'timestamp': datetime.datetime.now(
+                      datetime.timezone.utc).isoformat()}
+        result.update(self.default_tags)
+        result.update(tags)
+        LOG.info('%s %s=%s %s %s', self.id(), metric, value, unit, tags)
+        self.results.append(result)
+        return result
+
+    def record_distribution(self, metric, values, unit='s', **tags):
+        """Record the summary statistics of a set of measurements."""
+        summary = summarise(values)
+        return self.record(metric, summary.pop('p50', None), unit,
+                           **dict(summary, **tags))
+
+    @contextlib.contextmanager
+    def measure(self, metric, **tags):
+        """Record the time taken by the body of a with statement.
+
+        Nothing is recorded if the body raises an exception.
+        """
+        start = time.monotonic()
+        yield
+        self.record(metric, time.monotonic() - start, **tags)
+
+    def sample(self, metric, func, repetitions=None, **tags):
+        """Call func repeatedly and record the distribution of its latency.
+
+        :param repetitions: number of calls, [heat_benchmark] repetitions by
+                            default.
+        :returns: the result of the last call.
+        """
+        durations = []
+        for _ in range(repetitions or self.benchmark_conf.repetitions):
+            start = time.monotonic()
+            result = func()
+            durations.append(time.monotonic() - start)
+        self.record_distribution(metric, durations, **tags)
+        return result
+
+    def delete_stacks(self, stack_identifiers, max_workers=None):
+        """Delete stacks concurrently, logging the failures."""
+        for stack_identifier, _, error, _ in remote_client.run_concurrently(
+                self._stack_delete, stack_identifiers,
+                max_workers=max_workers):
+            if error is not None:
+                LOG.warning('Failed to delete %s: %s', stack_identifier,
+                            error)
+
+    def _emit_results(self):
+        if not self.results:
+            return
+        lines = [json.dumps(result, sort_keys=True)
+                 for result in self.results]
+        text = '\n'.join(lines) + '\n'
+        self.addDetail('benchmark-results', content.text_content(text))
+        results_file = self.benchmark_conf.results_file
+        if results_file:
+            with _results_file_lock, open(results_file, 'a') as f:
+                f.write(text)
@@ -0,0 +1,244 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Synthetic templates of arbitrary size for the benchmark tests.
+
+The templates only contain cheap resources, OS::Heat::TestResource or
+OS::Heat::None, so that the measurements reflect the work done by Heat
+itself rather than by other services.
+"""
+
+from heat_tempest_plugin.common import template_builder
+
+TEMPLATE_VERSION = '2015-10-15'
+TEST_RESOURCE = 'OS::Heat::TestResource'
+NONE_RESOURCE = 'OS::Heat::None'
+
+
+def resource_name(index):
+    return 'r%d' % index
+
+
+def parameter_name(index):
+    return 'p%d' % index
+
+
+def generate_parameters(parameter_count, revision=0):
+    """Return values for the parameters of a generated template."""
+    return dict((parameter_name(i), 'value-%d-%d' % (i, revision))
+                for i in range(parameter_count))
+
+
+def generate_template(resource_count, dependency_depth=1, parameter_count=0,
+                      resource_type=TEST_RESOURCE, revision=0,
+                      properties=None):
+    """Generate a template with resource_count resources.
+
+    The resources are laid out in dependency_depth layers, every resource
+    depending on the resource in the same column of the previous layer, so
+    the template is made of ceil(resource_count / dependency_depth)
+    independent chains of dependency_depth resources.
+
+    When parameter_count is not 0 the resources take their value from the
+    parameters in turn, otherwise the value is derived from revision.
+    Generating the same template with a different revision, or creating it
+    with parameters from generate_parameters() with a different revision,
+    changes the properties of every resource.
+
+    The properties mapping, e.g. ``{'wait_secs': 1}``, is added to the
+    properties of every resource.
+
+    The template has a ``result`` output: the ``output`` attribute of the
+    last resource for OS::Heat::TestResource, its reference for types such
+    as OS::Heat::None which have no such attribute.
+
+    :returns: a template_builder.FrozenMap.
+    """
+    depth = max(min(dependency_depth, resource_count), 1)
+    width = -(-resource_count // depth)
+    parameters = dict(
+        (parameter_name(i), {'type': 'string',
+                             'default': 'value-%d-0' % i})
+        for i in range(parameter_count))
+    resources = {}
+    for i in range(resource_count):
+        if parameter_count:
+            value = {'get_param': parameter_name(i % parameter_count)}
+        else:
+            value = '%s-%d' % (resource_name(i), revision)
+        resource = {'type': resource_type,
+                    'properties': dict(properties or {}, value=value)}
+        if i >= width:
+            resource['depends_on'] = resource_name(i - width)
+        resources[resource_name(i)] = resource
+    outputs = {}
+    if resource_count:
+        last = resource_name(resource_count - 1)
+        if resource_type == TEST_RESOURCE:
+            outputs['result'] = {'value': {'get_attr': [last, 'output']}}
+        else:
+            outputs['result'] = {'value': {'get_resource': last}}
+    return template_builder.freeze({
+        'heat_template_version': TEMPLATE_VERSION,
+        'parameters': parameters,
+        'resources': resources,
+        'outputs': outputs,
+    })
+
+
+def generate_nested_template(nesting_depth, resource_count, **kwargs):
+    """Wrap a generated template in nesting_depth levels of nested stacks.
+
+    Every level is a template resource with a single resource of the type of
+    the next level, all the parameters and the ``result`` output are passed
+    through. The keyword arguments are passed to generate_template() to
+    generate the innermost template.
+
+    :returns: a tuple of the top level template and the files map.
+    """
+    generated = generate_template(resource_count, **kwargs)
+    if not nesting_depth:
+        return generated, {}
+    inner = generated
+    files = {}
+    parameter_names = sorted(generated['parameters'])
+    for level in range(nesting_depth, 0, -1):
+        files['level_%d.yaml' % level] = inner
+        inner = template_builder.freeze({
+            'heat_template_version': TEMPLATE_VERSION,
+            'parameters': dict((name, {'type': 'string'})
+                               for name in parameter_names),
+            'resources': {
+                'nested': {
+                    'type': 'level_%d.yaml' % level,
+                    'properties': dict((name, {'get_param': name})
+                                       for name in parameter_names),
+                },
+            },
+            'outputs': {
+                'result': {'value': {'get_attr': ['nested', 'result']}},
+            },
+        })
+    # The top level keeps the defaults so it can be created without
+    # parameters, like the flat templates.
+    return inner.set('parameters', generated['parameters']), files
+
+
+def generate_fan_out_template(depth, fan_out):
+    """Generate a tree of nested stacks depth levels deep.
+
+    Every stack above the leaves has fan_out template resources of the type
+    of the next level, each leaf stack has one OS::Heat::TestResource. The
+    ``value`` parameter is passed down to the leaves, so changing it updates
+    every leaf, and the ``result`` output of every level is the list of the
+    outputs of its children, so resolving the top level output goes through
+    every level.
+
+    :returns: a tuple of the top level template and the files map.
+    """
+    template = template_builder.freeze({
+        'heat_template_version': TEMPLATE_VERSION,
+        'parameters': {'value': {'type': 'string', 'default': ''}},
+        'resources': {
+            'leaf': {'type': TEST_RESOURCE,
+                     'properties': {'value': {'get_param': 'value'}}},
+        },
+        'outputs': {
+            'result': {'value': {'get_attr': ['leaf', 'output']}},
+        },
+    })
+    files = {}
+    for level in range(depth, 0, -1):
+        files['level_%d.yaml' % level] = template
+        children = [resource_name(i) for i in range(fan_out)]
+        template = template_builder.freeze({
+            'heat_template_version': TEMPLATE_VERSION,
+            'parameters': {'value': {'type': 'string', 'default': ''}},
+            'resources': dict(
+                (name, {'type': 'level_%d.yaml' % level,
+                        'properties': {'value': {'get_param': 'value'}}})
+                for name in children),
+            'outputs': {
+                'result': {'value': [{'get_attr': [name, 'result']}
+                                     for name in children]},
+            },
+        })
+    return template, files
+
+
+def fan_out_size(depth, fan_out):
+    """Return the numbers of nested stacks and of leaves of a tree."""
+    return (sum(fan_out ** level for level in range(1, depth + 1)),
+            fan_out ** depth)
+
+
+def generate_outputs_template(output_count, complexity, resource_count=10):
+    """Generate a template with output_count outputs.
+
+    The complexity sets what every output resolves:
+
+    * ``attribute``: an attribute of one resource.
+    * ``composite``: a string joining an attribute of every resource.
+    * ``nested``: an attribute of a resource in a nested stack.
+
+    :returns: a tuple of the template and the files map.
+    """
+    template = generate_template(resource_count)
+    files = {}
+    names = [resource_name(i) for i in range(resource_count)]
+    if complexity == 'attribute':
+        values = [{'get_attr': [names[i % resource_count], 'output']}
+                  for i in range(output_count)]
+    elif complexity == 'composite':
+        values = [{'list_join': ['-', [{'get_attr': [name, 'output']}
+                                       for name in names] + [str(i)]]}
+                  for i in range(output_count)]
+    elif complexity == 'nested':
+        files['nested.yaml'] = template
+        template = template.set('resources',
+                                {'nested': {'type': 'nested.yaml'}})
+        values = [{'get_attr': ['nested',
+                                'resource.%s' % names[i % resource_count],
+                                'output']}
+                  for i in range(output_count)]
+    else:
+        raise ValueError('Unknown output complexity %s' % complexity)
+    outputs = dict(('o%d' % i, {'value': value})
+                   for i, value in enumerate(values))
+    return template.set('outputs', outputs), files
+
+
+def add_parameter_groups(template, group_count):
+    """Spread the parameters of a template across group_count groups."""
+    names = sorted(template.get('parameters', {}),
+                   key=lambda name: int(name[1:]))
+    group_count = min(group_count, len(names))
+    groups = [{'label': 'group-%d' % g,
+               'description': 'Parameter group %d' % g,
+               'parameters': names[g::group_count]}
+              for g in range(group_count)]
+    return template.set('parameter_groups', groups)
+
+
+def add_nested_templates(template, nested_count, resource_count=1):
+    """Add nested_count template resources, each of its own template.
+
+    :returns: a tuple of the template and the files map.
+    """
+    files = {}
+    resources = {}
+    for i in range(nested_count):
+        name = 'nested_%d.yaml' % i
+        files[name] = generate_template(resource_count, parameter_count=1)
+        resources['nested_%d' % i] = {'type': name,
+                                      'properties': {'p0': 'nested-%d' % i}}
+    return template.update_in(('resources',), resources), files
@@ -0,0 +1,121 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import re
+import time
+
+from heatclient import exc as heat_exceptions
+from oslo_utils import timeutils
+from tempest.lib import decorators
+
+from heat_tempest_plugin.common import exceptions
+from heat_tempest_plugin.tests.benchmark import benchmark_base
+from heat_tempest_plugin.tests.benchmark import template_generator
+
+
+class EngineComparisonBenchmark(benchmark_base.BenchmarkTestsBase):
+    """Run identical workloads to compare the convergence and legacy engines.
+
+    Every workload creates, updates, rolls back a failed update of and
+    deletes a stack of engine_stack_size OS::Heat::TestResource resources
+    with resource_wait_secs each, recording the latency of every phase.
+    The results are tagged with the engine mode, so the results of runs
+    against clouds using either engine can be compared.
+    """
+
+    hooks_environment = {
+        'resource_registry': {
+            'resources': {'r*': {'hooks': ['pre-create', 'pre-update']}}}}
+
+    def _clear_hooks(self, stack_identifier, hook, status):
+        """Clear hook on every resource as they reach it, until status."""
+        pending = set(template_generator.resource_name(i) for i in range(
+            self.benchmark_conf.engine_stack_size))
+        fail_regexp = re.compile('^.*_FAILED$')
+        start = timeutils.utcnow()
+        while timeutils.delta_seconds(
+                start, timeutils.utcnow()) < self.conf.build_timeout:
+            stack = self.client.stacks.get(stack_identifier,
+                                           resolve_outputs=False)
+            if self._verify_status(stack, stack_identifier, status,
+                                   fail_regexp):
+                return
+            for name in sorted(pending):
+                try:
+                    self.client.resources.signal(
+                        stack_identifier, name, data={'unset_hook': hook})
+                except heat_exceptions.HTTPBadRequest:
+                    # The resource has not reached the hook yet
+                    continue
+                pending.discard(name)
+            time.sleep(self.build_interval)
+        raise exceptions.TimeoutException(
+            'Stack %s failed to reach %s status within the required time '
+            '(%s s).' % (stack_identifier, status, self.conf.build_timeout))
+
+    def _run_workload(self, graph, dependency_depth=1, hooks=False):
+        size = self.benchmark_conf.engine_stack_size
+        properties = {'wait_secs': self.benchmark_conf.resource_wait_secs}
+        template = template_generator.generate_template(
+            size, dependency_depth, properties=properties)
+        updated = template_generator.generate_template(
+            size, dependency_depth, properties=properties, revision=1)
+        failing = updated.set_in(
+            ('resources', template_generator.resource_name(size - 1),
+             'properties', 'fail'), True)
+        environment = self.hooks_environment if hooks else {}
+        tags = {'graph': graph, 'hooks': hooks, 'resources': size}
+
+        with self.measure('create', **tags):
+            if hooks:
+                stack_identifier = self.stack_create(
+                    template=template, environment=environment,
+                    expected_status='CREATE_IN_PROGRESS')
+                self._clear_hooks(stack_identifier, 'pre-create',
+                                  'CREATE_COMPLETE')
+            else:
+                stack_identifier = self.stack_create(template=template)
+
+        with self.measure('update', **tags):
+            if hooks:
+                self.update_stack(stack_identifier, template=updated,
+                                  environment=environment,
+                                  expected_status='UPDATE_IN_PROGRESS')
+                self._clear_hooks(stack_identifier, 'pre-update',
+                                  'UPDATE_COMPLETE')
+            else:
+                self.update_stack(stack_identifier, template=updated)
+
+        # The rollback of a failed update would stop on the pre-update
+        # hooks of the previous environment, so it is only measured
+        # without hooks.
+        if not hooks:
+            with self.measure('rollback', **tags):
+                self.update_stack(stack_identifier, template=failing,
+                                  disable_rollback=False,
+                                  expected_status='ROLLBACK_COMPLETE')
+
+        with self.measure('delete', **tags):
+            self._stack_delete(stack_identifier)
+
+    @decorators.idempotent_id('5752c1ba-5865-4b38-be27-0557488af7d4')
+    def test_parallel_graph(self):
+        self._run_workload('parallel')
+
+    @decorators.idempotent_id('f22070fe-1d1e-478b-9ed1-34f66d2a255e')
+    def test_serial_graph(self):
+        self._run_workload(
+            'serial', dependency_depth=self.benchmark_conf.engine_stack_size)
+
+    @decorators.idempotent_id('8195f689-1619-4930-886a-3fd7153e4b10')
+    def test_parallel_graph_with_hooks(self):
+        self._run_workload('parallel', hooks=True)
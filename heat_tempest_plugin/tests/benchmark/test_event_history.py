@@ -0,0 +1,106 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_log import log as logging
+from tempest.lib import decorators
+
+from heat_tempest_plugin.tests.benchmark import benchmark_base
+from heat_tempest_plugin.tests.benchmark import template_generator
+
+LOG = logging.getLogger(__name__)
+
+
+class EventHistoryBenchmark(benchmark_base.BenchmarkTestsBase):
+    """Measure the events API latency as the event history grows.
+
+    A stack of event_stack_size resources and a nested stack of as many
+    resources is updated until its history reaches each of the
+    [heat_benchmark] event_history_sizes, every update changing all the
+    resources. The latency of event lists, with and without pagination and
+    filters, and of single event details is recorded at each size.
+    """
+
+    def setUp(self):
+        super(EventHistoryBenchmark, self).setUp()
+        size = self.benchmark_conf.event_stack_size
+        nested = template_generator.generate_template(size,
+                                                      parameter_count=1)
+        self.template = nested.set_in(
+            ('resources', 'nested'),
+            {'type': 'nested.yaml',
+             'properties': {'p0': {'get_param': 'p0'}}})
+        self.files = {'nested.yaml': nested}
+        self.revision = 0
+
+    def _count_events(self, stack_identifier):
+        return len(self.client.events.list(stack_identifier, nested_depth=1))
+
+    def _grow_history(self, stack_identifier, target, count):
+        """Update the stack until it has target events.
+
+        :returns: the number of events, and whether the history is capped.
+        """
+        while count < target:
+            self.revision += 1
+            with self.measure('update_cycle', events=count):
+                self.update_stack(
+                    stack_identifier, template=self.template,
+                    files=self.files,
+                    parameters=template_generator.generate_parameters(
+                        1, self.revision))
+            previous, count = count, self._count_events(stack_identifier)
+            if count <= previous:
+                LOG.warning('Event history of %s stopped growing at %d '
+                            'events, it is capped by max_events_per_stack',
+                            stack_identifier, count)
+                return count, True
+        return count, False
+
+    def _measure_events(self, stack_identifier, count):
+        tags = {'events': count}
+        page_size = self.benchmark_conf.page_size
+        events = self.sample('events_list',
+                             lambda: self.client.events.list(
+                                 stack_identifier), **tags)
+        middle = events[len(events) // 2]
+        self.sample('events_list_limit',
+                    lambda: self.client.events.list(
+                        stack_identifier, limit=page_size),
+                    page_size=page_size, **tags)
+        self.sample('events_list_marker',
+                    lambda: self.client.events.list(
+                        stack_identifier, limit=page_size,
+                        marker=middle.id),
+                    page_size=page_size, **tags)
+        self.sample('events_list_resource_name',
+                    lambda: self.client.events.list(
+                        stack_identifier, resource_name='r0'), **tags)
+        self.sample('events_list_nested_depth',
+                    lambda: self.client.events.list(
+                        stack_identifier, nested_depth=1), **tags)
+        self.sample('events_get',
+                    lambda: self.client.events.get(
+                        stack_identifier, middle.resource_name, middle.id),
+                    **tags)
+
+    @decorators.idempotent_id('3307e065-4b7d-40ff-adac-491eeda1d8de')
+    def test_event_history_growth(self):
+        stack_identifier = self.stack_create(
+            template=self.template, files=self.files,
+            parameters=template_generator.generate_parameters(1))
+        count = self._count_events(stack_identifier)
+        for target in sorted(self.benchmark_conf.event_history_sizes):
+            count, capped = self._grow_history(stack_identifier, target,
+                                               count)
+            self._measure_events(stack_identifier, count)
+            if capped:
+                break
@@ -0,0 +1,85 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_log import log as logging
+from tempest.lib import decorators
+
+from heat_tempest_plugin.tests.benchmark import benchmark_base
+from heat_tempest_plugin.tests.benchmark import template_generator
+
+LOG = logging.getLogger(__name__)
+
+
+def _flatten(value):
+    if isinstance(value, list):
+        for item in value:
+            for leaf in _flatten(item):
+                yield leaf
+    else:
+        yield value
+
+
+class NestedStackBenchmark(benchmark_base.BenchmarkTestsBase):
+    """Measure stack operations on trees of nested stacks.
+
+    For every combination of the [heat_benchmark] nested_depths and
+    nested_fan_outs, a tree of provider templates passed in the files map
+    is created, listed, shown with its outputs resolved through every
+    level, updated and deleted.
+    """
+
+    def _benchmark_tree(self, depth, fan_out):
+        template, files = template_generator.generate_fan_out_template(
+            depth, fan_out)
+        stacks, leaves = template_generator.fan_out_size(depth, fan_out)
+        tags = {'depth': depth, 'fan_out': fan_out,
+                'nested_stacks': stacks, 'leaves': leaves}
+
+        with self.measure('create', **tags):
+            stack_identifier = self.stack_create(
+                template=template, files=files,
+                parameters={'value': 'v0'})
+        resources = self.sample(
+            'resources_list_nested',
+            lambda: self.client.resources.list(stack_identifier,
+                                               nested_depth=depth),
+            **tags)
+        self.assertEqual(stacks + leaves, len(resources))
+        self.sample('resources_list_top',
+                    lambda: self.client.resources.list(stack_identifier),
+                    **tags)
+        self.sample('show_stack',
+                    lambda: self.client.stacks.get(stack_identifier,
+                                                   resolve_outputs=False),
+                    **tags)
+        stack = self.sample('show_stack_outputs',
+                            lambda: self.client.stacks.get(stack_identifier),
+                            **tags)
+        self.assertEqual(['v0'] * leaves,
+                         list(_flatten(self._stack_output(stack, 'result'))))
+        with self.measure('update', **tags):
+            self.update_stack(stack_identifier, template=template,
+                              files=files, parameters={'value': 'v1'})
+        with self.measure('delete', **tags):
+            self._stack_delete(stack_identifier)
+
+    @decorators.idempotent_id('5f6736f9-424d-4337-8fab-bbd45942ad55')
+    def test_nested_depth_fan_out(self):
+        for fan_out in sorted(self.benchmark_conf.nested_fan_outs):
+            for depth in sorted(self.benchmark_conf.nested_depths):
+                stacks, _ = template_generator.fan_out_size(depth, fan_out)
+                if stacks > self.benchmark_conf.nested_max_stacks:
+                    LOG.info('Skipping depth %d with fan-out %d, %d nested '
+                             'stacks is over nested_max_stacks',
+                             depth, fan_out, stacks)
+                    continue
+                self._benchmark_tree(depth, fan_out)
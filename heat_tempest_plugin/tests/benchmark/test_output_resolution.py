@@ -0,0 +1,64 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from tempest.lib import decorators
+
+from heat_tempest_plugin.tests.benchmark import benchmark_base
+from heat_tempest_plugin.tests.benchmark import template_generator
+
+
+class OutputResolutionBenchmark(benchmark_base.BenchmarkTestsBase):
+    """Compare the ways of reading stack outputs as their number grows.
+
+    For stacks with each of the [heat_benchmark] output_counts outputs,
+    records the latency of showing the stack with every output resolved,
+    of listing the outputs and of showing a single output, as used by
+    get_stack_output().
+    """
+
+    def _benchmark_outputs(self, complexity):
+        for count in self.benchmark_conf.output_counts:
+            template, files = template_generator.generate_outputs_template(
+                count, complexity)
+            tags = {'complexity': complexity, 'outputs': count}
+            stack_identifier = self.stack_create(template=template,
+                                                 files=files)
+            key = 'o%d' % (count // 2)
+
+            stack = self.sample(
+                'stack_show_resolved',
+                lambda: self.client.stacks.get(stack_identifier), **tags)
+            self.assertEqual(count, len(stack.outputs))
+            self.sample('stack_show_unresolved',
+                        lambda: self.client.stacks.get(
+                            stack_identifier, resolve_outputs=False),
+                        **tags)
+            self.sample('output_list',
+                        lambda: self.client.stacks.output_list(
+                            stack_identifier), **tags)
+            value = self.sample('output_show',
+                                lambda: self.get_stack_output(
+                                    stack_identifier, key), **tags)
+            self.assertEqual(self._stack_output(stack, key), value)
+            self._stack_delete(stack_identifier)
+
+    @decorators.idempotent_id('d90a2a34-43b8-46a2-a88d-06b9a379b2e2')
+    def test_attribute_outputs(self):
+        self._benchmark_outputs('attribute')
+
+    @decorators.idempotent_id('a68e4c0c-9a12-4cda-a6a2-3c8e1b4b8c87')
+    def test_composite_outputs(self):
+        self._benchmark_outputs('composite')
+
+    @decorators.idempotent_id('ed246118-23d4-4bc8-94a2-06c8a9be1e06')
+    def test_nested_outputs(self):
+        self._benchmark_outputs('nested')
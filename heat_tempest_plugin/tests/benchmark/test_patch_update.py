@@ -0,0 +1,128 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import time
+
+from tempest.lib import decorators
+
+from heat_tempest_plugin.tests.benchmark import benchmark_base
+from heat_tempest_plugin.tests.benchmark import template_generator
+
+# The resources take their value from the parameters in turn, so changing a
+# single parameter updates one resource in PARAMETER_COUNT.
+PARAMETER_COUNT = 10
+
+
+class PatchUpdateBenchmark(benchmark_base.BenchmarkTestsBase):
+    """Compare PATCH (existing=True) updates with full PUT updates.
+
+    For each of the [heat_benchmark] template_sizes, two identical stacks
+    are created and receive the same sequence of parameter changes, one
+    through full updates sending the template and every parameter, the
+    other through PATCH updates sending only the changed parameters. The
+    request payload size, the time to UPDATE_COMPLETE and the number of
+    resources touched, counted from the events, are recorded for changes of
+    a single parameter and of all the parameters.
+    """
+
+    METHODS = ('put', 'patch')
+
+    def setUp(self):
+        super(PatchUpdateBenchmark, self).setUp()
+        self.request_bodies = []
+        self.revision = 0
+        self.patch(self.client.stacks, 'update', self._recording_update(
+            self.client.stacks.update))
+
+    def _recording_update(self, update):
+        """Wrap stacks.update to keep the body of the requests it sends."""
+        def recording_update(stack_id, **kwargs):
+            # heatclient sends every other argument as the JSON body
+            body = dict(kwargs)
+            body.pop('existing', None)
+            self.request_bodies.append(json.dumps(body))
+            return update(stack_id, **kwargs)
+        return recording_update
+
+    def _last_event_id(self, stack_identifier):
+        events = self.client.events.list(stack_identifier, limit=1,
+                                         sort_dir='desc')
+        return events[0].id if events else None
+
+    def _touched_resources(self, stack_identifier, marker):
+        """Return the number of resources updated since the marker event."""
+        events = self.client.events.list(
+            stack_identifier, marker=marker, sort_dir='asc',
+            filters={'resource_action': 'UPDATE'})
+        stack_name = stack_identifier.split('/')[0]
+        return len(set(event.resource_name for event in events
+                       if event.resource_name != stack_name))
+
+    def _update(self, method, stack_identifier, template, parameters,
+                changed):
+        """Apply a change with a PUT or a PATCH update.
+
+        :returns: the payload size, the time to UPDATE_COMPLETE and the
+                  number of resources touched.
+        """
+        if method == 'patch':
+            fields = {'parameters': changed, 'existing': True}
+        else:
+            fields = {'template': template, 'parameters': parameters}
+        marker = self._last_event_id(stack_identifier)
+        start = time.monotonic()
+        self.update_stack(stack_identifier, **fields)
+        duration = time.monotonic() - start
+        return (len(self.request_bodies[-1]), duration,
+                self._touched_resources(stack_identifier, marker))
+
+    def _benchmark(self, size):
+        template = template_generator.generate_template(
+            size, parameter_count=PARAMETER_COUNT)
+        parameters = template_generator.generate_parameters(PARAMETER_COUNT)
+        stacks = dict((method, self.stack_create(template=template,
+                                                 parameters=parameters))
+                      for method in self.METHODS)
+
+        for change in ('one_parameter', 'all_parameters'):
+            durations = dict((method, []) for method in self.METHODS)
+            latest = {}
+            for _ in range(self.benchmark_conf.repetitions):
+                self.revision += 1
+                changed = template_generator.generate_parameters(
+                    1 if change == 'one_parameter' else PARAMETER_COUNT,
+                    self.revision)
+                parameters = dict(parameters, **changed)
+                for method in self.METHODS:
+                    payload_size, duration, touched = self._update(
+                        method, stacks[method], template, parameters,
+                        changed)
+                    durations[method].append(duration)
+                    latest[method] = payload_size, touched
+            # Both stacks went through the same changes
+            self.assertEqual(latest['put'][1], latest['patch'][1])
+            for method in self.METHODS:
+                tags = {'method': method, 'change': change, 'size': size}
+                payload_size, touched = latest[method]
+                self.record_distribution('update_complete',
+                                         durations[method], **tags)
+                self.record('request_bytes', payload_size, unit='B', **tags)
+                self.record('resources_touched', touched, unit='resources',
+                            **tags)
+
+        self.delete_stacks(stacks.values())
+
+    @decorators.idempotent_id('51d54773-1a4a-41fa-90fe-129d32426f52')
+    def test_patch_versus_put(self):
+        for size in self.benchmark_conf.template_sizes:
+            self._benchmark(size)
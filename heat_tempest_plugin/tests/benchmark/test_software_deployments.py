@@ -0,0 +1,111 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import time
+
+from tempest.lib import decorators
+
+from heat_tempest_plugin.common import remote_client
+from heat_tempest_plugin.common import test
+from heat_tempest_plugin.tests.benchmark import benchmark_base
+from heat_tempest_plugin.tests.functional import test_software_config
+
+
+@test.requires_service('glance')
+@test.requires_service('nova')
+@test.requires_service('neutron')
+class SoftwareDeploymentBenchmark(
+        test_software_config.ParallelDeploymentsMixin,
+        benchmark_base.BenchmarkTestsBase):
+    """Measure the server metadata fan-out of software deployments.
+
+    Each test scales one of the number of deployments to a server, the size
+    of the configs and the number of config stacks created concurrently,
+    the other two being kept at the first of their configured values. At
+    each step the time until the server metadata lists every deployment,
+    the metadata size and latency, and the signal throughput are recorded.
+    """
+
+    def setUp(self):
+        super(SoftwareDeploymentBenchmark, self).setUp()
+        self.stack_identifier, self.server = self.create_server()
+
+    def _deploy(self, deployments, config_size, config_stacks):
+        counts = [deployments // config_stacks +
+                  (1 if i < deployments % config_stacks else 0)
+                  for i in range(config_stacks)]
+        tags = {'deployments': deployments, 'config_size': config_size,
+                'config_stacks': config_stacks}
+
+        start = time.monotonic()
+        results = remote_client.run_concurrently(
+            lambda count: self.deploy_config(self.server, count,
+                                             config_size=config_size),
+            [count for count in counts if count], max_workers=config_stacks)
+        stack_identifiers = [result for _, result, _, _ in results]
+        for _, _, error, _ in results:
+            if error is not None:
+                raise error
+        metadata = self.wait_for_deploy_metadata_set(self.stack_identifier,
+                                                     deployments)
+        self.record('metadata_convergence', time.monotonic() - start,
+                    **tags)
+        self.record('metadata_size', len(json.dumps(metadata)), unit='B',
+                    **tags)
+        self.sample('resources_metadata',
+                    lambda: self.client.resources.metadata(
+                        self.stack_identifier, 'server'),
+                    **tags)
+
+        concurrency = self.benchmark_conf.signal_concurrency
+        start = time.monotonic()
+        signals = self.signal_deployments(self.stack_identifier,
+                                          max_workers=concurrency)
+        elapsed = time.monotonic() - start
+        errors = [error or response.status_code
+                  for _, response, error, _ in signals
+                  if error is not None or response.status_code >= 400]
+        self.record('signals_per_second', len(signals) / elapsed,
+                    unit='1/s', concurrency=concurrency, **tags)
+        self.record_distribution('signal_latency',
+                                 [duration for _, _, _, duration in signals],
+                                 concurrency=concurrency, **tags)
+        self.assertEqual([], errors)
+        for stack_identifier in stack_identifiers:
+            self._wait_for_stack_status(stack_identifier, 'CREATE_COMPLETE')
+        self.record('deployments_complete', time.monotonic() - start,
+                    concurrency=concurrency, **tags)
+
+        self.delete_stacks(stack_identifiers, config_stacks)
+        self.wait_for_deploy_metadata_set(self.stack_identifier, 0)
+
+    @decorators.idempotent_id('cc8ef362-7fb5-4a7b-a015-681a38ac7bbd')
+    def test_deployments_per_server(self):
+        for deployments in self.benchmark_conf.deployment_counts:
+            self._deploy(deployments,
+                         self.benchmark_conf.deployment_config_sizes[0],
+                         self.benchmark_conf.deployment_config_stacks[0])
+
+    @decorators.idempotent_id('700ff75f-5a8e-4b09-8d5f-1ad6c7e3ab6c')
+    def test_config_size(self):
+        for config_size in self.benchmark_conf.deployment_config_sizes:
+            self._deploy(self.benchmark_conf.deployment_counts[0],
+                         config_size,
+                         self.benchmark_conf.deployment_config_stacks[0])
+
+    @decorators.idempotent_id('750609ff-f921-475d-88f5-a7579b887725')
+    def test_concurrent_config_stacks(self):
+        for config_stacks in self.benchmark_conf.deployment_config_stacks:
+            self._deploy(self.benchmark_conf.deployment_counts[0],
+                         self.benchmark_conf.deployment_config_sizes[0],
+                         config_stacks)
@@ -0,0 +1,83 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+
+from heatclient import exc as heat_exceptions
+from oslo_log import log as logging
+from tempest.lib import decorators
+
+from heat_tempest_plugin.common import exceptions
+from heat_tempest_plugin.common import remote_client
+from heat_tempest_plugin.tests.benchmark import benchmark_base
+from heat_tempest_plugin.tests.benchmark import template_generator
+
+LOG = logging.getLogger(__name__)
+
+
+def classify_error(error):
+    """Return the kind of failure of a stack create, for the error rates."""
+    if isinstance(error, heat_exceptions.HTTPConflict):
+        return 'conflict'
+    if isinstance(error, exceptions.TimeoutException):
+        return 'timeout'
+    if isinstance(error, exceptions.StackBuildErrorException):
+        return 'failed'
+    return 'error'
+
+
+class StackCreateThroughputBenchmark(benchmark_base.BenchmarkTestsBase):
+    """Ramp up the number of concurrent stack creates.
+
+    At each of the [heat_benchmark] concurrency_levels, stacks_per_worker
+    stacks per worker are created with that many creates in flight, and the
+    throughput, the time to CREATE_COMPLETE and the error rates are
+    recorded. The stacks are deleted before the next step.
+    """
+
+    def _create(self, index):
+        return self.stack_create(template=self.template)
+
+    def _ramp_step(self, concurrency):
+        count = concurrency * self.benchmark_conf.stacks_per_worker
+        start = time.monotonic()
+        results = remote_client.run_concurrently(
+            self._create, range(count), max_workers=concurrency)
+        elapsed = time.monotonic() - start
+
+        completed = [duration for _, _, error, duration in results
+                     if error is None]
+        errors = {}
+        for _, _, error, _ in results:
+            if error is not None:
+                kind = classify_error(error)
+                errors[kind] = errors.get(kind, 0) + 1
+                LOG.info('Stack create failed (%s): %s', kind, error)
+        tags = {'concurrency': concurrency, 'stacks': count}
+        self.record('creates_per_second', len(completed) / elapsed,
+                    unit='1/s', **tags)
+        self.record_distribution('time_to_complete', completed, **tags)
+        self.record('error_rate', (count - len(completed)) / count,
+                    unit='ratio', errors=errors, **tags)
+        self.record('conflict_rate', errors.get('conflict', 0) / count,
+                    unit='ratio', **tags)
+
+        self.delete_stacks([result for _, result, error, _ in results
+                            if error is None], concurrency)
+
+    @decorators.idempotent_id('73c91b12-8000-44ae-bb31-d7d74ddff7ae')
+    def test_stack_create_ramp(self):
+        self.template = template_generator.generate_template(
+            self.benchmark_conf.throughput_stack_size,
+            properties={'wait_secs': self.benchmark_conf.resource_wait_secs})
+        for concurrency in self.benchmark_conf.concurrency_levels:
+            self._ramp_step(concurrency)
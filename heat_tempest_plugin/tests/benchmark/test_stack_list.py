@@ -0,0 +1,163 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from heatclient import exc as heat_exceptions
+from oslo_log import log as logging
+from tempest.lib import decorators
+
+from heat_tempest_plugin.common import remote_client
+from heat_tempest_plugin.common import test
+from heat_tempest_plugin.tests.benchmark import benchmark_base
+from heat_tempest_plugin.tests.benchmark import template_generator
+
+# One in SPARSE_RATIO stacks gets the sparse tag, and one in SPARSE_RATIO
+# (different) stacks gets the hidden tag.
+SPARSE_RATIO = 10
+
+LOG = logging.getLogger(__name__)
+
+
+def is_stack_quota_error(error):
+    """Return whether a stack create failed on max_stacks_per_tenant."""
+    return (isinstance(error, heat_exceptions.HTTPBadRequest) and
+            'maximum stacks per tenant' in str(error))
+
+
+class StackListBenchmark(benchmark_base.BenchmarkTestsBase):
+    """Measure the stack list latency as the project fills up.
+
+    The project is seeded with OS::Heat::None stacks up to each of the
+    [heat_benchmark] stack_list_counts, and the full, paginated, filtered,
+    hidden and sorted stack lists are timed at each count. Seeding stops at
+    the max_stacks_per_tenant quota, the lists are then timed at the number
+    of stacks seeded. All the seeded stacks are deleted at the end of the
+    test.
+    """
+
+    def setUp(self):
+        super(StackListBenchmark, self).setUp()
+        self.run_tag = test.rand_name('bench')
+        self.sparse_tag = self.run_tag + '-sparse'
+        self.template = template_generator.generate_template(
+            1, resource_type=template_generator.NONE_RESOURCE)
+        self.check_template(self.template)
+        self.seeded = []
+        self.addCleanup(self.delete_stacks, self.seeded,
+                        self.benchmark_conf.seed_concurrency)
+
+    def _tags(self, index):
+        tags = [self.run_tag]
+        if index % SPARSE_RATIO == 0:
+            tags.append(self.sparse_tag)
+        if (self.conf.hidden_stack_tag and
+                index % SPARSE_RATIO == SPARSE_RATIO // 2):
+            tags.append(self.conf.hidden_stack_tag)
+        return ','.join(tags)
+
+    def _seed_one(self, index):
+        stack_identifier = self.stack_create(
+            template=self.template, tags=self._tags(index),
+            expected_status=None, enable_cleanup=False)
+        self.seeded.append(stack_identifier)
+        self._wait_for_stack_status(stack_identifier, 'CREATE_COMPLETE')
+
+    def _seed_checked(self, index):
+        """Seed one stack, returning whether the stack quota was reached."""
+        try:
+            self._seed_one(index)
+        except heat_exceptions.HTTPBadRequest as e:
+            if not is_stack_quota_error(e):
+                raise
+            return True
+        return False
+
+    def _seed(self, count):
+        """Seed the project up to count stacks.
+
+        :returns: the number of stacks seeded, and whether the stack quota
+                  was reached.
+        """
+        start = len(self.seeded)
+        capped = False
+        with self.measure('seed', stacks=count - start):
+            if not start:
+                # Create the first stack on its own, so that a template Heat
+                # rejects fails the test here rather than in every worker.
+                capped = self._seed_checked(0)
+                start = 1
+            if not capped:
+                for _, _, error, _ in remote_client.run_concurrently(
+                        self._seed_one, range(start, count),
+                        max_workers=self.benchmark_conf.seed_concurrency):
+                    if is_stack_quota_error(error):
+                        capped = True
+                    elif error is not None:
+                        raise error
+        if capped:
+            LOG.warning('Seeding stopped at %d stacks, the project reached '
+                        'the max_stacks_per_tenant quota', len(self.seeded))
+            self.record('stack_quota', len(self.seeded), unit='stacks')
+        return len(self.seeded), capped
+
+    def _list(self, **kwargs):
+        return list(self.client.stacks.list(**kwargs))
+
+    def _list_pages(self):
+        page_size = self.benchmark_conf.page_size
+        marker = None
+        pages = 0
+        while True:
+            page = self._list(limit=page_size, marker=marker)
+            if not page:
+                return pages
+            pages += 1
+            marker = page[-1].id
+
+    def _measure_lists(self, count):
+        tags = {'stacks': count}
+        page_size = self.benchmark_conf.page_size
+        stacks = self.sample('list_full', self._list, **tags)
+        tags['listed_stacks'] = len(stacks)
+        self.sample('list_first_page',
+                    lambda: self._list(limit=page_size),
+                    page_size=page_size, **tags)
+        self.sample('list_middle_page',
+                    lambda: self._list(limit=page_size,
+                                       marker=stacks[len(stacks) // 2].id),
+                    page_size=page_size, **tags)
+        pages = self._list_pages()
+        self.sample('list_all_pages', self._list_pages,
+                    page_size=page_size, pages=pages, **tags)
+        self.sample('list_tag_filter',
+                    lambda: self._list(tags=self.run_tag), **tags)
+        self.sample('list_sparse_tag_filter',
+                    lambda: self._list(tags=self.sparse_tag), **tags)
+        self.sample('list_not_tags_filter',
+                    lambda: self._list(not_tags=self.sparse_tag), **tags)
+        self.sample('list_sort_name',
+                    lambda: self._list(sort_keys='stack_name',
+                                       sort_dir='asc'), **tags)
+        self.sample('list_sort_created_page',
+                    lambda: self._list(sort_keys='created_at',
+                                       sort_dir='desc', limit=page_size),
+                    page_size=page_size, **tags)
+        if self.conf.hidden_stack_tag:
+            self.sample('list_show_hidden',
+                        lambda: self._list(show_hidden=True), **tags)
+
+    @decorators.idempotent_id('1b652f07-5ce5-4adf-be96-428364e66774')
+    def test_stack_list_scaling(self):
+        for count in sorted(self.benchmark_conf.stack_list_counts):
+            count, capped = self._seed(count)
+            self._measure_lists(count)
+            if capped:
+                break
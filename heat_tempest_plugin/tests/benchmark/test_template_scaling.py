@@ -0,0 +1,98 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from tempest.lib import decorators
+
+from heat_tempest_plugin.common import test
+from heat_tempest_plugin.tests.benchmark import benchmark_base
+from heat_tempest_plugin.tests.benchmark import template_generator
+
+
+class TemplateScalingBenchmark(benchmark_base.BenchmarkTestsBase):
+    """Measure stack operations on growing synthetic templates.
+
+    Every test generates a template of each of the [heat_benchmark]
+    template_sizes and records the latency of validate, preview, create,
+    update and delete, tagged with the shape and size of the template.
+    """
+
+    def _payload_size(self, template, files):
+        return len(test.serialise_template(template)) + sum(
+            len(content) for content in test.serialise_files(files).values())
+
+    def _benchmark_sizes(self, shape, **kwargs):
+        for size in self.benchmark_conf.template_sizes:
+            self._benchmark_size(shape, size, **kwargs)
+
+    def _benchmark_size(self, shape, size, nesting_depth=0,
+                        parameter_count=0, **kwargs):
+        template, files = template_generator.generate_nested_template(
+            nesting_depth, size, parameter_count=parameter_count, **kwargs)
+        updated, updated_files = template_generator.generate_nested_template(
+            nesting_depth, size, parameter_count=parameter_count,
+            revision=1, **kwargs)
+        parameters = template_generator.generate_parameters(parameter_count)
+        updated_parameters = template_generator.generate_parameters(
+            parameter_count, revision=1)
+        tags = {'shape': shape,
+                'resource_count': size,
+                'nesting_depth': nesting_depth,
+                'parameter_count': parameter_count,
+                'payload_bytes': self._payload_size(template, files)}
+
+        with self.measure('validate', **tags):
+            self.client.stacks.validate(
+                template=test.serialise_template(template),
+                files=test.serialise_files(files),
+                environment={'parameters': parameters})
+        with self.measure('preview', **tags):
+            self.client.stacks.preview(
+                stack_name=self._stack_rand_name(),
+                template=test.serialise_template(template),
+                files=test.serialise_files(files),
+                parameters=parameters)
+        with self.measure('create', **tags):
+            stack_identifier = self.stack_create(
+                template=template, files=files, parameters=parameters)
+        with self.measure('update', **tags):
+            self.update_stack(stack_identifier, template=updated,
+                              files=updated_files,
+                              parameters=updated_parameters)
+        with self.measure('delete', **tags):
+            self._stack_delete(stack_identifier)
+
+    @decorators.idempotent_id('fa951ff4-498e-40e0-a56c-0195a746cf61')
+    def test_independent_resources(self):
+        self._benchmark_sizes('independent')
+
+    @decorators.idempotent_id('5f983818-1c46-463d-a2c7-879955b19dfa')
+    def test_parallel_dependency_chains(self):
+        self._benchmark_sizes('chains', dependency_depth=10)
+
+    @decorators.idempotent_id('afa15d62-1173-4cfd-ab71-35504e63c424')
+    def test_serial_dependency_chain(self):
+        self._benchmark_sizes('serial', dependency_depth=max(
+            self.benchmark_conf.template_sizes))
+
+    @decorators.idempotent_id('d1003302-8fb3-489a-a4cd-589f6dddc77b')
+    def test_parameters(self):
+        for size in self.benchmark_conf.template_sizes:
+            self._benchmark_size('parameters', size, parameter_count=size)
+
+    @decorators.idempotent_id('d173fc9a-757e-4df0-894a-0cce97d9e227')
+    def test_nested_template(self):
+        self._benchmark_sizes('nested', nesting_depth=3)
+
+    @decorators.idempotent_id('8cb69bb9-5624-4f0b-9b71-8a261c528e67')
+    def test_none_resources(self):
+        self._benchmark_sizes(
+            'none', resource_type=template_generator.NONE_RESOURCE)
@@ -0,0 +1,87 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from tempest.lib import decorators
+
+from heat_tempest_plugin.common import test
+from heat_tempest_plugin.tests.benchmark import benchmark_base
+from heat_tempest_plugin.tests.benchmark import template_generator
+
+
+class ValidatePreviewBenchmark(benchmark_base.BenchmarkTestsBase):
+    """Measure template validate and stack preview latency.
+
+    Each test grows one dimension of a template through the
+    [heat_benchmark] template_sizes: the number of parameters, of parameter
+    groups, of nested templates or of resources. The latency of validate,
+    with show_nested on and off, and of preview are recorded with the sizes
+    of the requests and responses.
+    """
+
+    def _benchmark(self, dimension, size, template, files=None):
+        template = test.serialise_template(template)
+        files = test.serialise_files(files)
+        tags = {'dimension': dimension, 'size': size,
+                'request_bytes': len(template) + sum(
+                    len(content) for content in files.values())}
+
+        for show_nested in (False, True):
+            result = self.sample(
+                'validate',
+                lambda: self.client.stacks.validate(
+                    template=template, files=files,
+                    show_nested=show_nested),
+                show_nested=show_nested, **tags)
+            self.record('validate_response_size', len(json.dumps(result)),
+                        unit='B', show_nested=show_nested, **tags)
+        result = self.sample(
+            'preview',
+            lambda: self.client.stacks.preview(
+                stack_name=self._stack_rand_name(), template=template,
+                files=files),
+            **tags)
+        self.record('preview_response_size',
+                    len(json.dumps(result.to_dict(), default=str)),
+                    unit='B', **tags)
+
+    @decorators.idempotent_id('9dde6f2f-d25e-4ff7-83a3-92e6fe77c98c')
+    def test_parameters(self):
+        for size in self.benchmark_conf.template_sizes:
+            self._benchmark('parameters', size,
+                            template_generator.generate_template(
+                                1, parameter_count=size))
+
+    @decorators.idempotent_id('af54efef-471f-4073-a0e6-9b422119df16')
+    def test_parameter_groups(self):
+        parameter_count = max(self.benchmark_conf.template_sizes)
+        template = template_generator.generate_template(
+            1, parameter_count=parameter_count)
+        for size in self.benchmark_conf.template_sizes:
+            self._benchmark('parameter_groups', size,
+                            template_generator.add_parameter_groups(
+                                template, size))
+
+    @decorators.idempotent_id('6c8b030d-293c-4a29-934a-fed92e4de465')
+    def test_nested_templates(self):
+        template = template_generator.generate_template(1)
+        for size in self.benchmark_conf.template_sizes:
+            self._benchmark('nested_templates', size,
+                            *template_generator.add_nested_templates(
+                                template, size))
+
+    @decorators.idempotent_id('450284eb-f3ba-4da3-8b41-1da9cb73eec3')
+    def test_resources(self):
+        for size in self.benchmark_conf.template_sizes:
+            self._benchmark('resources', size,
+                            template_generator.generate_template(size))
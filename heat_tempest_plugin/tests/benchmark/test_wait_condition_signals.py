@@ -0,0 +1,104 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import time
+
+import requests
+from tempest.lib import decorators
+
+from heat_tempest_plugin.common import remote_client
+from heat_tempest_plugin.tests.benchmark import benchmark_base
+
+
+class WaitConditionSignalBenchmark(benchmark_base.BenchmarkTestsBase):
+    """Measure how fast heat-api and heat-engine take wait condition signals.
+
+    No server is involved: the signals are sent from the test host to the
+    endpoint of the wait condition handle, signal_concurrency at a time, for
+    wait conditions expecting each of the [heat_benchmark]
+    wait_condition_counts signals.
+    """
+
+    template = '''
+heat_template_version: 2013-05-23
+parameters:
+  count:
+    type: number
+  timeout:
+    type: number
+resources:
+  wait_condition:
+    type: OS::Heat::WaitCondition
+    properties:
+      count: {get_param: count}
+      handle: {get_resource: wait_handle}
+      timeout: {get_param: timeout}
+  wait_handle:
+    type: OS::Heat::WaitConditionHandle
+outputs:
+  wc_data:
+    value:
+      get_attr: [wait_condition, data]
+'''
+
+    def _signal_all(self, stack_identifier, count):
+        handle = self.client.resources.get(stack_identifier, 'wait_handle')
+        endpoint = handle.attributes['endpoint']
+        headers = {'X-Auth-Token': handle.attributes['token'],
+                   'Content-Type': 'application/json',
+                   'Accept': 'application/json'}
+
+        def signal(index):
+            response = requests.post(
+                endpoint, headers=headers, verify=self.verify_cert,
+                data=json.dumps({'status': 'SUCCESS', 'id': str(index),
+                                 'data': 'signal-%d' % index}))
+            response.raise_for_status()
+
+        return remote_client.run_concurrently(
+            signal, range(count),
+            max_workers=self.benchmark_conf.signal_concurrency)
+
+    def _benchmark_count(self, count):
+        tags = {'signals': count,
+                'concurrency': self.benchmark_conf.signal_concurrency}
+        stack_identifier = self.stack_create(
+            template=self.template, expected_status=None,
+            parameters={'count': count,
+                        'timeout': self.conf.build_timeout})
+        self._wait_for_resource_status(stack_identifier, 'wait_handle',
+                                       'CREATE_COMPLETE')
+
+        start = time.monotonic()
+        results = self._signal_all(stack_identifier, count)
+        elapsed = time.monotonic() - start
+        errors = [error for _, _, error, _ in results if error is not None]
+        self.record('signals_per_second', count / elapsed, unit='1/s',
+                    **tags)
+        self.record_distribution('signal_latency',
+                                 [duration for _, _, _, duration in results],
+                                 **tags)
+        self.record('signal_error_rate', len(errors) / count, unit='ratio',
+                    **tags)
+        self.assertEqual([], errors)
+
+        self._wait_for_stack_status(stack_identifier, 'CREATE_COMPLETE')
+        self.record('time_to_complete', time.monotonic() - start, **tags)
+        self.assertEqual(count, len(json.loads(
+            self.get_stack_output(stack_identifier, 'wc_data'))))
+        self._stack_delete(stack_identifier)
+
+    @decorators.idempotent_id('43646a0b-9fc4-40fa-a52f-78d1354b5685')
+    def test_wait_condition_signal_throughput(self):
+        for count in self.benchmark_conf.wait_condition_counts:
+            self._benchmark_count(count)
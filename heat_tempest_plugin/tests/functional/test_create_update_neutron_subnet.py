@@ -41,9 +41,7 @@ outputs:
 class UpdateSubnetTest(functional_base.FunctionalTestsBase):
 
     def get_outputs(self, stack_identifier, output_key):
-        stack = self.client.stacks.get(stack_identifier)
-        output = self._stack_output(stack, output_key)
-        return output
+        return self.get_stack_output(stack_identifier, output_key)
 
     @decorators.idempotent_id('af43fc6d-58ba-4b5f-bd68-07b29f0a96bc')
     def test_update_allocation_pools(self):
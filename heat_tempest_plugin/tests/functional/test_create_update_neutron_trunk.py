@@ -13,10 +13,10 @@
 #    under the License.
 
 import copy
-import yaml
 
 from tempest.lib import decorators
 
+from heat_tempest_plugin.common import template_format
 from heat_tempest_plugin.common import test
 from heat_tempest_plugin.tests.functional import functional_base
 
@@ -103,13 +103,13 @@ class UpdateTrunkTest(functional_base.FunctionalTestsBase):
     def test_add_first_sub_port(self):
         stack_identifier = self.stack_create(template=test_template)
 
-        parsed_template = yaml.safe_load(test_template)
+        parsed_template = template_format.parse_snippet(test_template)
         new_sub_port = [{'port': {'get_resource': 'sub_port_one'},
                          'segmentation_id': 10,
                          'segmentation_type': 'vlan'}]
         parsed_template['resources']['trunk']['properties'][
             'sub_ports'] = new_sub_port
-        updated_template = yaml.safe_dump(parsed_template)
+        updated_template = template_format.dump(parsed_template)
         self.update_stack(stack_identifier, updated_template)
 
         # Fix the port_id in the template for assertion
@@ -125,13 +125,13 @@ class UpdateTrunkTest(functional_base.FunctionalTestsBase):
 
     @decorators.idempotent_id('c3f52330-01b7-4649-99fd-43700e6bbda3')
     def test_add_a_second_sub_port(self):
-        parsed_template = yaml.safe_load(test_template)
+        parsed_template = template_format.parse_snippet(test_template)
         sub_ports = [{'port': {'get_resource': 'sub_port_one'},
                       'segmentation_type': 'vlan',
                       'segmentation_id': 10}, ]
         parsed_template['resources']['trunk']['properties'][
             'sub_ports'] = sub_ports
-        template_with_sub_ports = yaml.safe_dump(parsed_template)
+        template_with_sub_ports = template_format.dump(parsed_template)
 
         stack_identifier = self.stack_create(template=template_with_sub_ports)
 
@@ -141,7 +141,7 @@ class UpdateTrunkTest(functional_base.FunctionalTestsBase):
         parsed_template['resources']['trunk']['properties'][
             'sub_ports'].append(new_sub_port)
 
-        updated_template = yaml.safe_dump(parsed_template)
+        updated_template = template_format.dump(parsed_template)
 
         self.update_stack(stack_identifier, updated_template)
 
@@ -168,10 +168,10 @@ class UpdateTrunkTest(functional_base.FunctionalTestsBase):
                      {'port': {'get_resource': 'sub_port_two'},
                       'segmentation_type': 'vlan',
                       'segmentation_id': 20}]
-        parsed_template = yaml.safe_load(test_template)
+        parsed_template = template_format.parse_snippet(test_template)
         parsed_template['resources']['trunk']['properties'][
             'sub_ports'] = sub_ports
-        template_with_sub_ports = yaml.safe_dump(parsed_template)
+        template_with_sub_ports = template_format.dump(parsed_template)
 
         stack_identifier = self.stack_create(template=template_with_sub_ports)
 
@@ -180,7 +180,7 @@ class UpdateTrunkTest(functional_base.FunctionalTestsBase):
                                   'segmentation_id': 20}
         parsed_template['resources']['trunk'][
             'properties']['sub_ports'].remove(sub_port_to_be_removed)
-        updated_template = yaml.safe_dump(parsed_template)
+        updated_template = template_format.dump(parsed_template)
 
         self.update_stack(stack_identifier, updated_template)
 
@@ -202,11 +202,11 @@ class UpdateTrunkTest(functional_base.FunctionalTestsBase):
         sub_ports = [{'port': {'get_resource': 'sub_port_one'},
                       'segmentation_type': 'vlan',
                       'segmentation_id': 10}]
-        parsed_template = yaml.safe_load(test_template)
+        parsed_template = template_format.parse_snippet(test_template)
         parsed_template['resources']['trunk']['properties'][
             'sub_ports'] = sub_ports
 
-        template_with_sub_ports = yaml.safe_dump(parsed_template)
+        template_with_sub_ports = template_format.dump(parsed_template)
         stack_identifier = self.stack_create(template=template_with_sub_ports)
 
         sub_port_to_be_removed = {'port': {'get_resource': 'sub_port_one'},
@@ -215,7 +215,7 @@ class UpdateTrunkTest(functional_base.FunctionalTestsBase):
 
         parsed_template['resources']['trunk'][
             'properties']['sub_ports'] = []
-        updated_template = yaml.safe_dump(parsed_template)
+        updated_template = template_format.dump(parsed_template)
 
         self.update_stack(stack_identifier, updated_template)
 
@@ -238,18 +238,18 @@ class UpdateTrunkTest(functional_base.FunctionalTestsBase):
         sub_ports = [{'port': {'get_resource': 'sub_port_one'},
                       'segmentation_type': 'vlan',
                       'segmentation_id': 10}]
-        parsed_template = yaml.safe_load(test_template)
+        parsed_template = template_format.parse_snippet(test_template)
         parsed_template['resources']['trunk']['properties'][
             'sub_ports'] = sub_ports
 
-        template_with_sub_ports = yaml.safe_dump(parsed_template)
+        template_with_sub_ports = template_format.dump(parsed_template)
         stack_identifier = self.stack_create(template=template_with_sub_ports)
 
         sub_port_id = self.get_physical_resource_id(
             stack_identifier, 'sub_port_one')
         parsed_template['resources']['trunk']['properties']['sub_ports'][0][
             'segmentation_id'] = 99
-        updated_template = yaml.safe_dump(parsed_template)
+        updated_template = template_format.dump(parsed_template)
 
         self.update_stack(stack_identifier, updated_template)
         updated_sub_port = {'port': sub_port_id,
@@ -269,11 +269,11 @@ class UpdateTrunkTest(functional_base.FunctionalTestsBase):
         new_description = 'This is a test trunk'
 
         stack_identifier = self.stack_create(template=test_template)
-        parsed_template = yaml.safe_load(test_template)
+        parsed_template = template_format.parse_snippet(test_template)
         parsed_template['resources']['trunk']['properties']['name'] = new_name
         parsed_template['resources']['trunk']['properties'][
             'description'] = new_description
-        updated_template = yaml.safe_dump(parsed_template)
+        updated_template = template_format.dump(parsed_template)
         self.update_stack(stack_identifier, template=updated_template)
 
         parent_id = self.get_stack_output(
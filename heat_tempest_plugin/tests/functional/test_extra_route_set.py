@@ -12,11 +12,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import yaml
-
 from oslo_log import log
 from tempest.lib import decorators
 
+from heat_tempest_plugin.common import template_format
 from heat_tempest_plugin.common import test
 from heat_tempest_plugin.tests.functional import functional_base
 
@@ -63,10 +62,10 @@ def _routes_to_set(routes):
 class ExtraRouteSetTest(functional_base.FunctionalTestsBase):
 
     def _create(self, template_routes):
-        parsed_template = yaml.safe_load(test_template)
+        parsed_template = template_format.parse_snippet(test_template)
         parsed_template['resources'][
             'extrarouteset0']['properties']['routes'] = template_routes
-        create_template = yaml.safe_dump(parsed_template)
+        create_template = template_format.dump(parsed_template)
 
         stack_id = self.stack_create(template=create_template)
 
@@ -100,10 +99,10 @@ class ExtraRouteSetTest(functional_base.FunctionalTestsBase):
     def _update(self, template_routes):
         stack_id = self.stack_create(template=test_template)
 
-        parsed_template = yaml.safe_load(test_template)
+        parsed_template = template_format.parse_snippet(test_template)
         parsed_template['resources'][
             'extrarouteset0']['properties']['routes'] = template_routes
-        updated_template = yaml.safe_dump(parsed_template)
+        updated_template = template_format.dump(parsed_template)
         self.update_stack(stack_id, updated_template)
 
         neutron_router_id = self.get_physical_resource_id(
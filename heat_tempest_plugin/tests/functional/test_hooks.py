@@ -10,10 +10,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import yaml
-
 from tempest.lib import decorators
 
+from heat_tempest_plugin.common import template_builder
 from heat_tempest_plugin.tests.functional import functional_base
 
 
@@ -21,13 +20,14 @@ class HooksTest(functional_base.FunctionalTestsBase):
 
     def setUp(self):
         super(HooksTest, self).setUp()
-        self.template = {'heat_template_version': '2014-10-16',
-                         'resources': {
-                             'foo_step1': {'type': 'OS::Heat::RandomString'},
-                             'foo_step2': {'type': 'OS::Heat::RandomString',
-                                           'depends_on': 'foo_step1'},
-                             'foo_step3': {'type': 'OS::Heat::RandomString',
-                                           'depends_on': 'foo_step2'}}}
+        self.template = template_builder.freeze({
+            'heat_template_version': '2014-10-16',
+            'resources': {
+                'foo_step1': {'type': 'OS::Heat::RandomString'},
+                'foo_step2': {'type': 'OS::Heat::RandomString',
+                              'depends_on': 'foo_step1'},
+                'foo_step3': {'type': 'OS::Heat::RandomString',
+                              'depends_on': 'foo_step2'}}})
 
     @decorators.idempotent_id('f14cbe86-0392-474a-9f28-bb561745698d')
     def test_hook_pre_create(self):
@@ -115,10 +115,11 @@ class HooksTest(functional_base.FunctionalTestsBase):
         res_before = self.client.resources.get(stack_identifier, 'foo_step2')
         # Note we don't wait for UPDATE_COMPLETE, because we need to
         # signal to clear the hook before update will complete
-        self.template['resources']['foo_step2']['properties'] = {'length': 10}
+        template = self.template.set_in(
+            ('resources', 'foo_step2', 'properties'), {'length': 10})
         self.update_stack(
             stack_identifier,
-            template=self.template,
+            template=template,
             environment=env,
             expected_status='UPDATE_IN_PROGRESS')
 
@@ -152,24 +153,25 @@ class HooksTest(functional_base.FunctionalTestsBase):
                {'resources':
                 {'rg':
                  {'hooks': 'pre-update'}}}}
-        template = {'heat_template_version': '2014-10-16',
-                    'resources': {
-                        'rg': {
-                            'type': 'OS::Heat::ResourceGroup',
-                            'properties': {
-                                'count': 1,
-                                'resource_def': {
-                                    'type': 'OS::Heat::RandomString'}}}}}
+        template = template_builder.freeze({
+            'heat_template_version': '2014-10-16',
+            'resources': {
+                'rg': {
+                    'type': 'OS::Heat::ResourceGroup',
+                    'properties': {
+                        'count': 1,
+                        'resource_def': {
+                            'type': 'OS::Heat::RandomString'}}}}})
         # Note we don't wait for CREATE_COMPLETE, because we need to
         # signal to clear the hook before create will complete
         stack_identifier = self.stack_create(
             template=template,
             environment=env)
         res_before = self.client.resources.get(stack_identifier, 'rg')
-        template['resources']['rg']['properties']['count'] = 2
         self.update_stack(
             stack_identifier,
-            template=template,
+            template=template.set_in(
+                ('resources', 'rg', 'properties', 'count'), 2),
             environment=env,
             expected_status='UPDATE_IN_PROGRESS')
 
@@ -198,7 +200,7 @@ class HooksTest(functional_base.FunctionalTestsBase):
 
     @decorators.idempotent_id('7d96b5f4-4aba-493d-b098-4beea4654a2b')
     def test_hook_pre_create_nested(self):
-        files = {'nested.yaml': yaml.safe_dump(self.template)}
+        files = {'nested.yaml': self.template}
         env = {'resource_registry':
                {'resources':
                 {'nested':
@@ -191,8 +191,7 @@ outputs:
 class CreateServerTest(functional_base.FunctionalTestsBase):
 
     def get_outputs(self, stack_identifier, output_key):
-        stack = self.client.stacks.get(stack_identifier)
-        return self._stack_output(stack, output_key)
+        return self.get_stack_output(stack_identifier, output_key)
 
     @decorators.idempotent_id('58ccf0aa-7531-4eaa-8ed5-38663a4defaa')
     def test_create_server_with_subnet_fixed_ip_sec_group(self):
@@ -258,8 +257,7 @@ class UpdateServerNetworksTest(functional_base.FunctionalTestsBase):
                        'image': self.conf.minimal_image_ref}
 
     def get_outputs(self, stack_identifier, output_key):
-        stack = self.client.stacks.get(stack_identifier)
-        return self._stack_output(stack, output_key)
+        return self.get_stack_output(stack_identifier, output_key)
 
     @decorators.idempotent_id('c1a22dbf-3160-41b7-8d3f-62ca33fc35a8')
     def test_create_update_server_swap_network_subnet(self):
@@ -13,6 +13,7 @@
 from heatclient import exc
 from tempest.lib import decorators
 
+from heat_tempest_plugin.common import exceptions
 from heat_tempest_plugin.tests.functional import functional_base
 
 
@@ -123,6 +124,13 @@ parameters:
         # break the template so it fails validation.
         wont_work = self.template.replace('get_param: incomming',
                                           'get_param: missing')
+        excp = self.assertRaises(exceptions.TemplateValidationError,
+                                 self.check_template, wont_work)
+        self.assertIn('resources.two.properties.value: '
+                      'The Parameter (missing) was not provided.',
+                      str(excp))
+
+        # Heat remains the authoritative check
         excp = self.assertRaises(exc.HTTPBadRequest,
                                  self.client.stacks.preview,
                                  template=wont_work,
@@ -17,20 +17,25 @@ import subprocess
 import sys
 import tempfile
 import time
-import yaml
 
 from oslo_utils import timeutils
 from tempest.lib import decorators
 
 from heat_tempest_plugin.common import exceptions
+from heat_tempest_plugin.common import remote_client
+from heat_tempest_plugin.common import template_builder
+from heat_tempest_plugin.common import template_format
 from heat_tempest_plugin.common import test
 from heat_tempest_plugin.tests.functional import functional_base
 
 
-@test.requires_service('glance')
-@test.requires_service('nova')
-@test.requires_service('neutron')
-class ParallelDeploymentsTest(functional_base.FunctionalTestsBase):
+class ParallelDeploymentsMixin(object):
+    """Deploy many software configs to a server and wait for its metadata.
+
+    Shared by ParallelDeploymentsTest and the software deployment
+    benchmarks.
+    """
+
     server_template = '''
 heat_template_version: "2013-05-23"
 parameters:
@@ -73,42 +78,8 @@ properties:
 
     enable_cleanup = True
 
-    @decorators.idempotent_id('8ee231ff-f80a-4a17-a860-5cda87e18ad0')
-    def test_deployments_metadata(self):
-        parms = {'flavor': self.conf.minimal_instance_type,
-                 'network': self.conf.fixed_network_name,
-                 'image': self.conf.minimal_image_ref}
-        stack_identifier = self.stack_create(
-            parameters=parms,
-            template=self.server_template,
-            enable_cleanup=self.enable_cleanup)
-        server_stack = self.client.stacks.get(stack_identifier)
-        server = server_stack.outputs[0]['output_value']
-
-        config_stacks = []
-        # add up to 3 stacks each with up to 3 deployments
-        deploy_count = 0
-        deploy_count = self.deploy_many_configs(
-            stack_identifier,
-            server,
-            config_stacks,
-            2,
-            5,
-            deploy_count)
-        self.deploy_many_configs(
-            stack_identifier,
-            server,
-            config_stacks,
-            3,
-            3,
-            deploy_count)
-
-        self.signal_deployments(stack_identifier)
-        for config_stack in config_stacks:
-            self._wait_for_stack_status(config_stack, 'CREATE_COMPLETE')
-
-    @decorators.idempotent_id('bd539232-b999-4bec-b47d-ff4822fc8b82')
-    def test_deployments_timeout_failed(self):
+    def create_server(self):
+        """Create the server stack, return its identifier and server id."""
         parms = {'flavor': self.conf.minimal_instance_type,
                  'network': self.conf.fixed_network_name,
                  'image': self.conf.minimal_image_ref}
@@ -117,20 +88,7 @@ properties:
             template=self.server_template,
             enable_cleanup=self.enable_cleanup)
         server_stack = self.client.stacks.get(stack_identifier)
-        server = server_stack.outputs[0]['output_value']
-        config_stack = self.deploy_config(server, 3, 1)
-        self._wait_for_stack_status(config_stack, 'CREATE_FAILED')
-        kwargs = {'server_id': server}
-
-        def check_deployment_status():
-            sd_list = self.client.software_deployments.list(**kwargs)
-            for sd in sd_list:
-                if sd.status != 'FAILED':
-                    return False
-            return True
-
-        self.assertTrue(test.call_until_true(
-            20, 0, check_deployment_status))
+        return stack_identifier, server_stack.outputs[0]['output_value']
 
     def deploy_many_configs(self, stack, server, config_stacks,
                             stack_count, deploys_per_stack,
@@ -143,13 +101,19 @@ properties:
         self.wait_for_deploy_metadata_set(stack, new_count)
         return new_count
 
-    def deploy_config(self, server, deploy_count, timeout=None):
+    def deploy_config(self, server, deploy_count, timeout=None,
+                      config_size=10000):
         parms = {'server': server}
-        template = yaml.safe_load(self.config_template)
-        resources = template['resources']
-        resources['config']['properties'] = {'config': 'x' * 10000}
-        for a in range(deploy_count):
-            resources['dep_%s' % a] = yaml.safe_load(self.deployment_snippet)
+        template = template_builder.freeze(
+            template_format.parse_snippet(self.config_template))
+        template = template.set_in(
+            ('resources', 'config', 'properties'),
+            {'config': 'x' * config_size})
+        deployment = template_builder.freeze(
+            template_format.parse_snippet(self.deployment_snippet))
+        template = template.update_in(
+            ('resources',),
+            dict(('dep_%s' % a, deployment) for a in range(deploy_count)))
         return self.stack_create(
             parameters=parms,
             template=template,
@@ -158,8 +122,12 @@ properties:
             timeout=timeout)
 
     def wait_for_deploy_metadata_set(self, stack, deploy_count):
+        """Wait for the server metadata to list deploy_count deployments.
+
+        :returns: the server metadata.
+        """
         build_timeout = self.conf.build_timeout
-        build_interval = self.conf.build_interval
+        build_interval = self.build_interval
 
         start = timeutils.utcnow()
         while timeutils.delta_seconds(start,
@@ -167,7 +135,7 @@ properties:
             server_metadata = self.client.resources.metadata(
                 stack, 'server')
             if len(server_metadata['deployments']) == deploy_count:
-                return
+                return server_metadata
             time.sleep(build_interval)
 
         message = ('Deployment resources failed to be created within '
@@ -175,15 +143,79 @@ properties:
                    (build_timeout))
         raise exceptions.TimeoutException(message)
 
-    def signal_deployments(self, stack_identifier):
+    def signal_deployments(self, stack_identifier, max_workers=1):
+        """Signal every deployment of the server, max_workers at a time.
+
+        :returns: list of (deployment, response, error, duration) tuples.
+        """
         server_metadata = self.client.resources.metadata(
             stack_identifier, 'server')
-        for dep in server_metadata['deployments']:
+
+        def signal(dep):
             iv = dict((i['name'], i['value']) for i in dep['inputs'])
             sigurl = iv.get('deploy_signal_id')
-            requests.post(sigurl, data='{}',
-                          headers={'content-type': 'application/json'},
-                          verify=self.verify_cert)
+            return requests.post(sigurl, data='{}',
+                                 headers={'content-type': 'application/json'},
+                                 verify=self.verify_cert)
+
+        return remote_client.run_concurrently(
+            signal, server_metadata['deployments'], max_workers=max_workers)
+
+
+@test.requires_service('glance')
+@test.requires_service('nova')
+@test.requires_service('neutron')
+class ParallelDeploymentsTest(ParallelDeploymentsMixin,
+                              functional_base.FunctionalTestsBase):
+
+    @decorators.idempotent_id('8ee231ff-f80a-4a17-a860-5cda87e18ad0')
+    def test_deployments_metadata(self):
+        stack_identifier, server = self.create_server()
+
+        config_stacks = []
+        # add up to 3 stacks each with up to 3 deployments
+        deploy_count = 0
+        deploy_count = self.deploy_many_configs(
+            stack_identifier,
+            server,
+            config_stacks,
+            2,
+            5,
+            deploy_count)
+        self.deploy_many_configs(
+            stack_identifier,
+            server,
+            config_stacks,
+            3,
+            3,
+            deploy_count)
+
+        # Fail on a failed signal rather than waiting for the config
+        # stacks to time out
+        errors = [error or response.status_code
+                  for _, response, error, _ in self.signal_deployments(
+                      stack_identifier)
+                  if error is not None or response.status_code >= 400]
+        self.assertEqual([], errors)
+        for config_stack in config_stacks:
+            self._wait_for_stack_status(config_stack, 'CREATE_COMPLETE')
+
+    @decorators.idempotent_id('bd539232-b999-4bec-b47d-ff4822fc8b82')
+    def test_deployments_timeout_failed(self):
+        stack_identifier, server = self.create_server()
+        config_stack = self.deploy_config(server, 3, 1)
+        self._wait_for_stack_status(config_stack, 'CREATE_FAILED')
+        kwargs = {'server_id': server}
+
+        def check_deployment_status():
+            sd_list = self.client.software_deployments.list(**kwargs)
+            for sd in sd_list:
+                if sd.status != 'FAILED':
+                    return False
+            return True
+
+        self.assertTrue(test.call_until_true(
+            20, 0, check_deployment_status))
 
 
 @test.requires_service_type('messaging')
@@ -64,6 +64,8 @@ outputs:
             stack_identifier, 'resource_output_b')['output']
         self.assertEqual(expected_output_a, actual_output_a)
         self.assertEqual(expected_output_b, actual_output_b)
+        self.assertEqual('a', self.get_stack_output(stack_identifier,
+                                                    'resource_output_a'))
 
     before_template = '''
 heat_template_version: 2015-10-15
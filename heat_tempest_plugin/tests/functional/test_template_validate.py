@@ -14,6 +14,7 @@
 from heatclient import exc
 from tempest.lib import decorators
 
+from heat_tempest_plugin.common import exceptions
 from heat_tempest_plugin.tests.functional import functional_base
 
 
@@ -87,6 +88,7 @@ resources:
 
     @decorators.idempotent_id('b65a80c2-a507-4deb-9e7e-43181cc05211')
     def test_template_validate_basic(self):
+        self.check_template(self.random_template)
         ret = self.client.stacks.validate(template=self.random_template)
         expected = {'Description': 'the stack description',
                     'Parameters': {
@@ -164,6 +166,9 @@ resources:
     @decorators.idempotent_id('7aac1feb-8256-4f70-8459-5e9780d28904')
     def test_template_validate_fail_version(self):
         fail_template = self.random_template.replace('2014-10-16', 'invalid')
+        ex = self.assertRaises(exceptions.TemplateValidationError,
+                               self.check_template, fail_template)
+        self.assertIn('The template version is invalid', str(ex))
         ex = self.assertRaises(exc.HTTPBadRequest,
                                self.client.stacks.validate,
                                template=fail_template)
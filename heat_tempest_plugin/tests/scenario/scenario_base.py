@@ -11,13 +11,47 @@
 #    under the License.
 
 import os
-import yaml
+import types
+import urllib.parse
 
 from heatclient.common import template_utils
 from oslo_utils import reflection
 
+from heat_tempest_plugin.common import template_format
 from heat_tempest_plugin.common import test
 
+# Templates loaded by _load_template, keyed by path. Each entry holds the
+# modification times of the template and of its resolved files, the dumped
+# template and a read-only view of the resolved files map.
+_template_cache = {}
+
+
+def _mtimes(paths):
+    return tuple((path, os.stat(path).st_mtime_ns) for path in paths)
+
+
+def _get_template_contents(filepath):
+    cached = _template_cache.get(filepath)
+    if cached is not None:
+        mtimes, template, files = cached
+        try:
+            if _mtimes(path for path, _mtime in mtimes) == mtimes:
+                return template, files
+        except OSError:
+            pass
+
+    files = {}
+    _files, template = template_utils.get_template_contents(filepath,
+                                                            files=files)
+    template = template_format.dump(template)
+    paths = [filepath]
+    for url in files:
+        if url.startswith('file:'):
+            paths.append(urllib.parse.unquote(urllib.parse.urlparse(url).path))
+    files = types.MappingProxyType(files)
+    _template_cache[filepath] = (_mtimes(paths), template, files)
+    return template, files
+
 
 class ScenarioTestsBase(test.HeatIntegrationTest):
     """This class defines common parameters for scenario tests."""
@@ -41,9 +75,10 @@ class ScenarioTestsBase(test.HeatIntegrationTest):
         sub_dir = sub_dir or ''
         filepath = os.path.join(os.path.dirname(os.path.realpath(base_file)),
                                 sub_dir, file_name)
-        _files, template = template_utils.get_template_contents(filepath,
-                                                                files=files)
-        return yaml.safe_dump(template)
+        template, resolved_files = _get_template_contents(filepath)
+        if files is not None:
+            files.update(resolved_files)
+        return template
 
     def launch_stack(self, template_name, expected_status='CREATE_COMPLETE',
                      parameters=None, **kwargs):
@@ -0,0 +1,273 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import fixtures
+from tempest.lib import decorators
+import testscenarios
+import testtools
+
+from heat_tempest_plugin.common import exceptions
+from heat_tempest_plugin.common import template_validator
+
+
+class FakeSchemas(object):
+    """Resource type schemas, as returned by ResourceTypeSchemas."""
+
+    SCHEMAS = {
+        'OS::Heat::TestResource': {
+            'properties': {'value': {}, 'fail': {}},
+            'attributes': {'output': {}},
+        },
+        'OS::Heat::None': {'properties': {}, 'attributes': {}},
+        'OS::Heat::RandomString': {
+            'properties': {'length': {'required': True}},
+            'attributes': {'value': {}},
+        },
+        'OS::Heat::ResourceGroup': {
+            'properties': {'count': {}, 'resource_def': {'required': True}},
+            'attributes': {'refs': {}},
+        },
+        'OS::Heat::SoftwareDeployment': {
+            'properties': {'server': {}, 'config': {}},
+            'attributes': {'deploy_stdout': {}},
+        },
+    }
+
+    def names(self):
+        return frozenset(self.SCHEMAS)
+
+    def get(self, resource_type):
+        return self.SCHEMAS.get(resource_type)
+
+
+def _template(version='2015-10-15', **sections):
+    return dict(sections, heat_template_version=version)
+
+
+def _previous_version(version):
+    versions = template_validator.HOT_VERSIONS
+    return versions[versions.index(version) - 1]
+
+
+class FunctionVersionTest(testscenarios.WithScenarios, testtools.TestCase):
+    """Every function is accepted from the version Heat introduced it in."""
+
+    scenarios = [
+        ('repeat', dict(function='repeat', version='2015-04-30',
+                        args={'for_each': {'x': ['a']}, 'template': 'x'})),
+        ('digest', dict(function='digest', version='2015-04-30',
+                        args=['sha512', 'x'])),
+        ('str_split', dict(function='str_split', version='2015-10-15',
+                           args=[',', 'a,b'])),
+        ('map_merge', dict(function='map_merge', version='2016-04-08',
+                           args=[{'a': 1}, {'b': 2}])),
+        ('map_replace', dict(function='map_replace', version='2016-10-14',
+                             args=[{'a': 1}, {'keys': {'a': 'b'}}])),
+        ('yaql', dict(function='yaql', version='2016-10-14',
+                      args={'expression': '$.data', 'data': 1})),
+        ('filter', dict(function='filter', version='2017-02-24',
+                        args=[[1], [1, 2]])),
+        ('str_replace_strict', dict(function='str_replace_strict',
+                                    version='2017-02-24',
+                                    args={'template': 'x',
+                                          'params': {'x': 'y'}})),
+        ('str_replace_vstrict', dict(function='str_replace_vstrict',
+                                     version='2017-09-01',
+                                     args={'template': 'x',
+                                           'params': {'x': 'y'}})),
+        ('make_url', dict(function='make_url', version='2017-09-01',
+                          args={'host': 'example.com'})),
+        ('list_concat', dict(function='list_concat', version='2017-09-01',
+                             args=[[1], [2]])),
+        ('list_concat_unique', dict(function='list_concat_unique',
+                                    version='2017-09-01',
+                                    args=[[1], [1]])),
+        ('contains', dict(function='contains', version='2017-09-01',
+                          args=[1, [1]])),
+    ]
+
+    def _validate(self, version):
+        return template_validator.validate(_template(
+            version,
+            outputs={'out': {'value': {self.function: self.args}}}))
+
+    @decorators.idempotent_id('6e704bb5-4c2d-4c9c-b8d9-e664373dade6')
+    def test_first_version(self):
+        self.assertEqual([], self._validate(self.version))
+
+    @decorators.idempotent_id('9e9c8010-2198-4cda-9669-e07516fad2c4')
+    def test_previous_version(self):
+        version = _previous_version(self.version)
+        self.assertEqual(
+            ['outputs.out.value: "%s" is not supported by '
+             'heat_template_version %s' % (self.function, version)],
+            self._validate(version))
+
+
+class RequiredPropertiesTest(testscenarios.WithScenarios,
+                             testtools.TestCase):
+
+    nested = _template(parameters={
+        'required': {'type': 'string'},
+        'optional': {'type': 'string', 'default': 'x'},
+    })
+
+    scenarios = [
+        ('nested_assigned', dict(
+            resource={'type': 'nested.yaml',
+                      'properties': {'required': 'x'}},
+            environment=None, errors=[])),
+        ('nested_missing', dict(
+            resource={'type': 'nested.yaml'},
+            environment=None,
+            errors=['resources.res.properties: Property required not '
+                    'assigned'])),
+        ('nested_parameter_defaults', dict(
+            resource={'type': 'nested.yaml'},
+            environment={'parameter_defaults': {'required': 'x'}},
+            errors=[])),
+        ('nested_unknown', dict(
+            resource={'type': 'nested.yaml',
+                      'properties': {'required': 'x', 'unknown': 'x'}},
+            environment=None,
+            errors=['resources.res.properties: Unknown Property '
+                    'unknown'])),
+        ('schema_assigned', dict(
+            resource={'type': 'OS::Heat::RandomString',
+                      'properties': {'length': 8}},
+            environment=None, errors=[])),
+        ('schema_missing', dict(
+            resource={'type': 'OS::Heat::RandomString'},
+            environment=None,
+            errors=['resources.res.properties: Property length not '
+                    'assigned'])),
+        ('registry_mapped', dict(
+            resource={'type': 'My::Nested'},
+            environment={'resource_registry': {'My::Nested': 'nested.yaml'},
+                         'parameter_defaults': {'required': 'x'}},
+            errors=[])),
+        ('registry_unknown', dict(
+            resource={'type': 'My::Nested'},
+            environment=None,
+            errors=['resources.res: The Resource Type (My::Nested) could '
+                    'not be found.'])),
+    ]
+
+    @decorators.idempotent_id('10753f75-ef1f-4230-9260-0b16eba8dee5')
+    def test_properties(self):
+        errors = template_validator.validate(
+            _template(resources={'res': self.resource}),
+            files={'nested.yaml': self.nested}, schemas=FakeSchemas(),
+            environment=self.environment)
+        self.assertEqual(self.errors, errors)
+
+
+class OutputReferencesTest(testscenarios.WithScenarios, testtools.TestCase):
+
+    resources = {
+        'test': {'type': 'OS::Heat::TestResource'},
+        'none': {'type': 'OS::Heat::None'},
+        'group': {'type': 'OS::Heat::ResourceGroup',
+                  'properties': {'resource_def': {'type': 'OS::Heat::None'}}},
+        'deployment': {'type': 'OS::Heat::SoftwareDeployment'},
+    }
+
+    scenarios = [
+        ('attribute', dict(value={'get_attr': ['test', 'output']},
+                           errors=[])),
+        ('resource', dict(value={'get_resource': 'none'}, errors=[])),
+        ('unknown_resource', dict(
+            value={'get_resource': 'missing'},
+            errors=['outputs.out.value: The specified reference "missing" '
+                    'is incorrect.'])),
+        ('unknown_attr_resource', dict(
+            value={'get_attr': ['missing', 'output']},
+            errors=['outputs.out.value: The specified reference "missing" '
+                    'is incorrect.'])),
+        ('unknown_attribute', dict(
+            value={'get_attr': ['none', 'output']},
+            errors=['outputs.out.value: The Referenced Attribute (none '
+                    'output) is incorrect.'])),
+        ('group_member', dict(value={'get_attr': ['group', 'resource.0']},
+                              errors=[])),
+        ('deployment_output', dict(
+            value={'get_attr': ['deployment', 'result']}, errors=[])),
+    ]
+
+    @decorators.idempotent_id('56f34a07-acb8-4e67-b65c-2456a274b047')
+    def test_output(self):
+        errors = template_validator.validate(
+            _template(resources=self.resources,
+                      outputs={'out': {'value': self.value}}),
+            schemas=FakeSchemas())
+        self.assertEqual(self.errors, errors)
+
+    @decorators.idempotent_id('5e428dbf-1711-4438-83d5-cd1bb4d0619b')
+    def test_resource_property(self):
+        resources = dict(self.resources, ref={
+            'type': 'OS::Heat::TestResource',
+            'properties': {'value': self.value}})
+        errors = template_validator.validate(
+            _template(resources=resources), schemas=FakeSchemas())
+        self.assertEqual(
+            [e.replace('outputs.out', 'resources.ref.properties')
+             for e in self.errors], errors)
+
+
+class MissingParameterTest(testtools.TestCase):
+
+    def setUp(self):
+        super(MissingParameterTest, self).setUp()
+        self.log = self.useFixture(fixtures.FakeLogger())
+
+    @decorators.idempotent_id('a28d1d71-b04c-4526-b269-de64d344411c')
+    def test_output(self):
+        # Heat only resolves the outputs when they are shown
+        errors = template_validator.validate(_template(
+            outputs={'out': {'value': {'get_param': 'missing'}}}))
+        self.assertEqual([], errors)
+        self.assertIn('outputs.out.value: The Parameter (missing) was not '
+                      'provided.', self.log.output)
+
+    @decorators.idempotent_id('ad1a2639-3cb2-40f9-99a1-91b6b7fd478e')
+    def test_resource_property(self):
+        errors = template_validator.validate(_template(resources={
+            'ref': {'type': 'OS::Heat::TestResource',
+                    'properties': {'value': {'get_param': 'missing'}}}}),
+            schemas=FakeSchemas())
+        self.assertEqual(['resources.ref.properties.value: The Parameter '
+                          '(missing) was not provided.'], errors)
+        self.assertEqual('', self.log.output)
+
+
+class CheckTest(testtools.TestCase):
+
+    @decorators.idempotent_id('1a66d409-36fa-4475-ac92-2f081bab9661')
+    def test_check_raises(self):
+        ex = self.assertRaises(
+            exceptions.TemplateValidationError, template_validator.check,
+            _template('invalid'))
+        self.assertEqual(
+            ['The template version is invalid: heat_template_version: '
+             'invalid'], ex.errors)
+
+    @decorators.idempotent_id('76d2ceec-8c63-4853-9a85-8f0a5f653bf0')
+    def test_check_valid(self):
+        template_validator.check(_template(resources={
+            'test': {'type': 'OS::Heat::TestResource'}}),
+            schemas=FakeSchemas())
+
+    @decorators.idempotent_id('ce906c70-6661-46a5-907c-c6de2c67a548')
+    def test_environment_not_a_mapping(self):
+        self.assertEqual(
+            ['The environment is not a JSON object or YAML mapping.'],
+            template_validator.validate(_template(), environment='- x'))